@@ -0,0 +1,156 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from aoc import backends, instrument
+from aoc.memory import format_report
+from aoc.runner import Options, discover, run_days, table
+
+# Some parts never finish on random inputs, e.g. day 11 when the octopuses
+# never flash at once, so generated inputs always run with a deadline
+GENERATED_TIMEOUT = 30.0
+
+
+def deadline(value: str) -> tuple[int, float]:
+
+    day, separator, seconds = value.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected DAY=SECONDS, got {value!r}")
+    return int(day), float(seconds)
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc", description="Run and time Advent of Code solutions"
+    )
+    parser.add_argument(
+        "days", nargs="*", type=int, help="days to run (default: all days)"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profiles"),
+        metavar="DIRECTORY",
+        help="profile each day and write .pstats and collapsed-stack files "
+        "to DIRECTORY (default: profiles)",
+    )
+    modes.add_argument(
+        "--memory",
+        action="store_true",
+        help="report peak traced memory, final RSS and the top allocation sites",
+    )
+    parser.add_argument(
+        "--input-cache",
+        action="store_true",
+        help="load parsed inputs from the on-disk cache instead of parsing them",
+    )
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="skip days whose inputs and source have not changed since they "
+        "last succeeded",
+    )
+    parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="report the counters, timers and cache statistics recorded by "
+        "the solutions",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="run every day in an isolated subprocess and kill it after SECONDS",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=deadline,
+        action="append",
+        default=[],
+        metavar="DAY=SECONDS",
+        help="deadline for a particular day, overriding --timeout; implies "
+        "isolation and may be repeated",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        metavar="N",
+        help="solve generated inputs of size N instead of the puzzle inputs, "
+        "without checking the answers; implies --timeout "
+        f"{GENERATED_TIMEOUT:g} unless one is given",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for generated inputs (default: 0)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=backends.available(),
+        help="implementation of the array kernels (default: numpy if installed)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.memory and sys.version_info < (3, 11):
+        print("--memory needs Python 3.11 or later", file=sys.stderr)
+        return 2
+    if args.backend:
+        backends.use(args.backend)
+    available = discover()
+    days = args.days or available
+    if unknown := sorted(set(days) - set(available)):
+        print(f"Unknown days: {', '.join(map(str, unknown))}", file=sys.stderr)
+        return 2
+
+    options = Options(
+        args.profile,
+        args.memory,
+        args.input_cache,
+        args.result_cache,
+        args.counters,
+        args.timeout
+        if args.timeout is not None or args.size is None
+        else GENERATED_TIMEOUT,
+        dict(args.deadline),
+        args.size,
+        args.seed,
+    )
+    start = time.perf_counter()
+    timings = list(run_days(days, args.workers, options))
+    elapsed = time.perf_counter() - start
+
+    print(table(timings))
+    print(
+        f"\n{len(timings)} days in {elapsed:.3f} s wall, "
+        f"{sum(t.wall for t in timings):.3f} s summed wall, "
+        f"{sum(t.cpu for t in timings):.3f} s summed cpu"
+    )
+    if args.memory:
+        for timing in sorted(timings, key=lambda t: t.day):
+            if timing.memory:
+                print(f"\n{format_report(f'day{timing.day}', timing.memory)}")
+    if args.counters:
+        for timing in sorted(timings, key=lambda t: t.day):
+            report = timing.counters
+            if report and (report.counters or report.timers):
+                print(f"\n{instrument.format_report(f'day{timing.day}', report)}")
+    if args.profile:
+        print(f"Profiles written to {args.profile}/")
+    return 0 if all(t.ok for t in timings) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Interchangeable pure Python and NumPy implementations of array kernels
+
+The solutions only need the standard library, but kernels that are array
+shaped can register a vectorised NumPy implementation next to their pure
+Python one. NumPy is used whenever it can be imported, unless the AOC_BACKEND
+environment variable or use() says otherwise. Worker processes inherit the
+variable, so they use the same backend.
+"""
+from __future__ import annotations
+import functools
+import os
+from typing import Any, Callable, Generic, TypeVar
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+from aoc.grid import Grid
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+BACKENDS = ("python", "numpy")
+
+KERNELS: list[Kernel[Any]] = []
+
+
+def available() -> list[str]:
+    return [name for name in BACKENDS if name == "python" or numpy is not None]
+
+
+def default() -> str:
+
+    name = os.environ.get("AOC_BACKEND", "")
+    if not name:
+        return "numpy" if numpy is not None else "python"
+    if name not in available():
+        raise ImportError(f"AOC_BACKEND={name} is not available")
+    return name
+
+
+current = default()
+
+
+def use(name: str) -> None:
+    """Forces the backend, here and in the processes started from here on"""
+
+    global current
+    if name not in available():
+        raise ValueError(f"backend {name} is not available")
+    current = name
+    os.environ["AOC_BACKEND"] = name
+
+
+class Kernel(Generic[Function]):
+    """A pure Python function that may have implementations in other backends"""
+
+    def __init__(self, python: Function) -> None:
+        functools.update_wrapper(self, python)
+        self.implementations: dict[str, Callable[..., Any]] = {"python": python}
+        KERNELS.append(self)
+
+    def numpy(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        self.implementations["numpy"] = function
+        return function
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        implementation = self.implementations.get(current)
+        return (implementation or self.implementations["python"])(*args, **kwargs)
+
+
+def kernel(function: Function) -> Kernel[Function]:
+    return Kernel(function)
+
+
+def cells(grid: Grid) -> Any:
+    """The cells within the grid, without the border, as a 2D NumPy array"""
+
+    padded = numpy.frombuffer(grid.cells, dtype=numpy.uint8).reshape(-1, grid.stride)
+    padding = grid.padding
+    return padded[padding : padding + grid.height, padding : padding + grid.width]
@@ -0,0 +1,169 @@
+"""Solve one day over many inputs
+
+Inputs are handed to a process pool in chunks and every result is written as
+a JSON line as soon as its chunk completes, so neither the inputs nor the
+results are ever held in memory all at once. The workers are not daemonic,
+so days such as 18 can start pools of their own.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterable, Iterator
+
+from aoc.cache import cached_result
+from aoc.parsing import Source
+from aoc.runner import discover, load, parts, prepare
+
+
+def expand(patterns: Iterable[str]) -> Iterator[Path]:
+    """Lazily yields the files in the given directories or matching the globs"""
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            yield from (child for child in path.iterdir() if child.is_file())
+        else:
+            yield from map(Path, glob.iglob(pattern, recursive=True))
+
+
+def answers(module: ModuleType, source: Source) -> list[Any]:
+    data = prepare(module, module.parse_input(source))
+    return [part(data) for part in parts(module)]
+
+
+def solve_input(day: int, result_cache: bool, path: Path) -> dict[str, Any]:
+
+    module = load(day)
+    error = None
+    results: list[Any] = []
+    cached = False
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if result_cache:
+            results, cached = cached_result(
+                module, "answers", [path], lambda: answers(module, path)
+            )
+        else:
+            results = answers(module, path)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    record: dict[str, Any] = {"input": str(path)}
+    for number, _ in enumerate(parts(module), 1):
+        record[f"part{number}"] = results[number - 1] if results else None
+    record.update(wall=round(wall, 6), cpu=round(cpu, 6), cached=cached, error=error)
+    return record
+
+
+def solve_chunk(
+    day: int, result_cache: bool, paths: list[Path]
+) -> list[dict[str, Any]]:
+    return [solve_input(day, result_cache, path) for path in paths]
+
+
+def solve_inputs(
+    day: int,
+    paths: Iterable[Path],
+    workers: int | None,
+    chunksize: int,
+    result_cache: bool,
+) -> Iterator[dict[str, Any]]:
+    """Yields a record for every input in completion order
+
+    Only a couple of chunks per worker are submitted at a time, so the inputs
+    are expanded no faster than they are solved.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    remaining = iter(paths)
+    pending: set[Future[list[dict[str, Any]]]] = set()
+    with ProcessPoolExecutor(workers) as pool:
+        while True:
+            while len(pending) < 2 * workers and (
+                chunk := list(islice(remaining, chunksize))
+            ):
+                pending.add(pool.submit(solve_chunk, day, result_cache, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.batch",
+        description="Solve one day over many inputs, writing JSON lines to stdout",
+    )
+    parser.add_argument("day", type=int)
+    parser.add_argument(
+        "inputs", nargs="+", help="directories of input files or glob patterns"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=4,
+        help="inputs handed to a worker at a time, and so also the number of "
+        "results that arrive together (default: 4)",
+    )
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help="reuse the answers for inputs that were solved before",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.day not in discover():
+        print(f"Unknown day: {args.day}", file=sys.stderr)
+        return 2
+
+    solved = failed = 0
+    start = time.perf_counter()
+    records = solve_inputs(
+        args.day,
+        expand(args.inputs),
+        args.workers,
+        args.chunksize,
+        args.result_cache,
+    )
+    for record in records:
+        print(json.dumps(record), flush=True)
+        solved += 1
+        failed += record["error"] is not None
+    elapsed = time.perf_counter() - start
+
+    if not solved:
+        print(f"No inputs match {' '.join(args.inputs)}", file=sys.stderr)
+        return 2
+    print(
+        f"{solved} inputs in {elapsed:.3f} s, {solved / elapsed:.1f} inputs/s, "
+        f"{failed} failed",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+from aoc import backends
+from aoc.cache import cached_parse_input, input_path
+from aoc.generate import write
+from aoc.memory import size, trace
+from aoc.runner import discover, load, parts, prepare
+
+
+@dataclass(frozen=True)
+class Case:
+
+    name: str
+    day: int
+    # Builds the arguments of the function from an input file, or from the
+    # day's own input when no file is given
+    setup: Callable[[Path | None], tuple[Any, ...]]
+    function: Callable[..., Any]
+    generated: bool = True
+    # parse, part1 or part2 for cases that time one phase of a day
+    phase: str = ""
+
+
+@dataclass(frozen=True)
+class Result:
+
+    name: str
+    repeat: int
+    min: float
+    median: float
+    p95: float
+
+
+def parsed(module: ModuleType, path: Path | None, input_cache: bool = True) -> Any:
+    parse_input = cached_parse_input(module) if input_cache else module.parse_input
+    return parse_input(path) if path else parse_input()
+
+
+def solve_case(day: int) -> Case:
+    return Case(f"day{day}.solve", day, lambda _: (), load(day).solve, False)
+
+
+def phase_cases(day: int, input_cache: bool = True) -> list[Case]:
+    """Cases timing the day's parsing, preparing and each of its parts on their own"""
+
+    module = load(day)
+    cases = [
+        Case(
+            f"day{day}.parse",
+            day,
+            lambda path: (path,) if path else (),
+            module.parse_input,
+            phase="parse",
+        )
+    ]
+    if hasattr(module, "prepare"):
+        cases.append(
+            Case(
+                f"day{day}.prepare",
+                day,
+                lambda path: (parsed(module, path, input_cache),),
+                module.prepare,
+                phase="prepare",
+            )
+        )
+    for number, part in enumerate(parts(module), 1):
+        cases.append(
+            Case(
+                f"day{day}.part{number}",
+                day,
+                lambda path: (prepare(module, parsed(module, path, input_cache)),),
+                part,
+                phase=f"part{number}",
+            )
+        )
+    return cases
+
+
+def core_cases(input_cache: bool = True) -> list[Case]:
+    def parse(module: ModuleType, path: Path | None) -> Any:
+        return parsed(module, path, input_cache)
+
+    day1 = load(1)
+    day2 = load(2)
+    day4 = load(4)
+    day5 = load(5)
+    day12 = load(12)
+    day15 = load(15)
+    day17 = load(17)
+    day19 = load(19)
+    day22 = load(22)
+    day23 = load(23)
+
+    return [
+        Case(
+            "day1.count_increases",
+            1,
+            lambda path: (parse(day1, path), 3),
+            day1.count_increases,
+        ),
+        Case(
+            "day1.stream_increases",
+            1,
+            lambda path: (input_path(day1, path), 3),
+            lambda source, offset: day1.count_increases(day1.depths(source), offset),
+        ),
+        Case(
+            "day2.navigate_log",
+            2,
+            lambda path: (input_path(day2, path), True),
+            day2.navigate_log,
+        ),
+        Case("day4.bingo", 4, lambda path: (parse(day4, path),), day4.bingo),
+        Case(
+            "day5.intersections",
+            5,
+            lambda path: (parse(day5, path),),
+            day5.intersections,
+        ),
+        Case(
+            "day12.paths",
+            12,
+            lambda path: (parse(day12, path), ["start"], {"start"}),
+            day12.paths,
+        ),
+        Case(
+            "day15.lowest_risk",
+            15,
+            lambda path: (parse(day15, path),),
+            day15.lowest_risk,
+        ),
+        Case(
+            "day15.lowest_risk_tiled",
+            15,
+            lambda path: (day15.tiled_grid(parse(day15, path)),),
+            day15.lowest_risk,
+        ),
+        Case(
+            "day17.successful_probes",
+            17,
+            lambda path: tuple(parse(day17, path)),
+            day17.successful_probes,
+        ),
+        Case(
+            "day19.align_scanners",
+            19,
+            lambda path: (parse(day19, path),),
+            day19.align_scanners,
+        ),
+        Case(
+            "day22.split_cuboids",
+            22,
+            lambda path: (parse(day22, path),),
+            day22.split_cuboids,
+        ),
+        Case(
+            "day23.least_energy",
+            23,
+            lambda path: (parse(day23, path),),
+            day23.least_energy,
+        ),
+    ]
+
+
+def all_cases(input_cache: bool = True) -> list[Case]:
+    return (
+        [solve_case(day) for day in discover()]
+        + [case for day in discover() for case in phase_cases(day, input_cache)]
+        + core_cases(input_cache)
+    )
+
+
+def select(cases: list[Case], patterns: list[str]) -> list[Case]:
+    """Selects cases matching any of the patterns, either exactly or by day"""
+
+    if not patterns:
+        return cases
+    return [
+        case
+        for case in cases
+        if any(case.name == p or case.name.startswith(f"{p}.") for p in patterns)
+    ]
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Nearest-rank percentile"""
+
+    ordered = sorted(samples)
+    rank = max(1, round(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(
+    case: Case, repeat: int, warmup: int, path: Path | None = None, name: str = ""
+) -> Result:
+
+    args = case.setup(path)
+    for _ in range(warmup):
+        case.function(*args)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.function(*args)
+        samples.append(time.perf_counter() - start)
+
+    return Result(
+        name or case.name,
+        repeat,
+        min(samples),
+        statistics.median(samples),
+        percentile(samples, 95),
+    )
+
+
+def peak_memory(case: Case, path: Path | None = None) -> int:
+    """Peak traced allocations of one call, excluding the setup"""
+
+    args = case.setup(path)
+    return trace(lambda: case.function(*args), top=0).peak
+
+
+def runs(
+    cases: list[Case], sizes: list[int], seed: int, directory: Path
+) -> Iterator[tuple[str, Case, Path | None]]:
+    """Yields the cases to measure, once per size when using generated inputs"""
+
+    if not sizes:
+        for case in cases:
+            yield case.name, case, None
+        return
+
+    for case in cases:
+        for n in sizes:
+            path = write(case.day, n, directory / f"day{case.day}-{n}.txt", seed)
+            yield f"{case.name}[n={n}]", case, path
+
+
+def breakdown(results: list[tuple[Case, Result]]) -> str:
+    """Table of the median parse, prepare, part 1 and part 2 times of each day"""
+
+    medians: dict[str, dict[str, float]] = {}
+    for case, result in results:
+        # Keeps the size suffix of generated inputs, e.g. day15[n=100]
+        label = f"day{case.day}{result.name.removeprefix(case.name)}"
+        medians.setdefault(label, {})[case.phase] = result.median
+
+    rows = [
+        f"{'':<36} {'parse (s)':>10} {'prep (s)':>10} {'part 1 (s)':>10} "
+        f"{'part 2 (s)':>10}"
+    ]
+    for label, phases in medians.items():
+        columns = [
+            f"{phases[phase]:.4f}" if phase in phases else ""
+            for phase in ("parse", "prepare", "part1", "part2")
+        ]
+        rows.append(
+            f"{label:<36} {columns[0]:>10} {columns[1]:>10} {columns[2]:>10} "
+            f"{columns[3]:>10}"
+        )
+    return "\n".join(rows)
+
+
+def load_baseline(path: Path) -> dict[str, Result]:
+    if not path.exists():
+        return {}
+    return {
+        name: Result(**result)
+        for name, result in json.loads(path.read_text())["results"].items()
+    }
+
+
+def save_baseline(path: Path, results: dict[str, Result]) -> None:
+    path.write_text(
+        json.dumps(
+            {"results": {name: asdict(result) for name, result in results.items()}},
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n"
+    )
+
+
+def regressions(
+    results: list[Result], baseline: dict[str, Result], threshold: float
+) -> list[tuple[Result, Result]]:
+    """Returns (result, baseline) pairs whose median slowed down beyond threshold"""
+
+    return [
+        (result, baseline[result.name])
+        for result in results
+        if result.name in baseline
+        and result.median > baseline[result.name].median * (1 + threshold)
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.bench",
+        description="Benchmark solutions and compare them against a stored baseline",
+    )
+    parser.add_argument(
+        "cases",
+        nargs="*",
+        help="cases to run, e.g. day15 or day23.least_energy (default: all)",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--baseline", type=Path, default=Path("aoc-bench.json"), help="baseline file"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed relative slowdown of the median (default: 0.1)",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs="+",
+        default=[],
+        help="run on generated inputs of these sizes instead of the puzzle inputs",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for generated inputs (default: 0)"
+    )
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help="always parse inputs instead of loading them from the on-disk cache",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="report the peak traced allocations of each case instead of timings",
+    )
+    parser.add_argument(
+        "--phases",
+        action="store_true",
+        help="time the parse, prepare, part 1 and part 2 phases of the selected "
+        "days and report them side by side",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=backends.available(),
+        help="implementation of the array kernels (default: numpy if installed)",
+    )
+    parser.add_argument("--list", action="store_true", help="list available cases")
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.backend:
+        backends.use(args.backend)
+    cases = select(all_cases(not args.no_input_cache), args.cases)
+    if args.size:
+        cases = [case for case in cases if case.generated]
+    if args.phases:
+        cases = [case for case in cases if case.phase]
+
+    if args.list:
+        print("\n".join(case.name for case in cases))
+        return 0
+    if not cases:
+        print(f"No cases match {' '.join(args.cases)}", file=sys.stderr)
+        return 2
+
+    if args.memory:
+        print(f"{'case':<36} {'peak':>12}")
+        with TemporaryDirectory() as directory:
+            for name, case, path in runs(cases, args.size, args.seed, Path(directory)):
+                print(f"{name:<36} {size(peak_memory(case, path)):>12}", flush=True)
+        return 0
+
+    if args.phases:
+        timed = []
+        with TemporaryDirectory() as directory:
+            for name, case, path in runs(cases, args.size, args.seed, Path(directory)):
+                timed.append(
+                    (case, measure(case, args.repeat, args.warmup, path, name))
+                )
+        print(breakdown(timed))
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    results = []
+
+    print(
+        f"{'case':<36} {'min (s)':>10} {'median (s)':>11} {'p95 (s)':>10} {'base':>7}"
+    )
+    with TemporaryDirectory() as directory:
+        for name, case, path in runs(cases, args.size, args.seed, Path(directory)):
+            result = measure(case, args.repeat, args.warmup, path, name)
+            results.append(result)
+            change = (
+                f"{result.median / baseline[name].median - 1:+7.1%}"
+                if name in baseline
+                else ""
+            )
+            print(
+                f"{result.name:<36} {result.min:>10.4f} {result.median:>11.4f} "
+                f"{result.p95:>10.4f} {change:>7}",
+                flush=True,
+            )
+
+    if args.save:
+        save_baseline(
+            args.baseline, baseline | {result.name: result for result in results}
+        )
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if slow := regressions(results, baseline, args.threshold):
+        print(f"\nRegressions beyond {args.threshold:.0%}:", file=sys.stderr)
+        for result, base in slow:
+            print(
+                f"  {result.name}: {base.median:.4f} s -> {result.median:.4f} s",
+                file=sys.stderr,
+            )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
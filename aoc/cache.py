@@ -0,0 +1,152 @@
+"""Content-addressed on-disk caches
+
+Parsed inputs and results are keyed on the SHA-256 of the input files and of
+the day's puzzle.py source, including any aoc modules it uses, so editing
+either one invalidates the cached entries.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from aoc.parsing import Source
+
+CACHE_DIRECTORY = Path(
+    os.environ.get("AOC_CACHE_DIR", Path.home() / ".cache" / "aoc-2021")
+)
+
+
+def file_digest(path: Path) -> str:
+
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dependencies(module: ModuleType) -> set[ModuleType]:
+    """Returns the module and every aoc module it uses, directly or not"""
+
+    found = {module}
+    pending = [module]
+    while pending:
+        for value in vars(pending.pop()).values():
+            name = value.__name__ if isinstance(value, ModuleType) else None
+            name = name or getattr(value, "__module__", None)
+            if not isinstance(name, str) or not name.startswith("aoc."):
+                continue
+            dependency = sys.modules.get(name)
+            if dependency and dependency not in found:
+                found.add(dependency)
+                pending.append(dependency)
+    return found
+
+
+@functools.cache
+def source_digest(module: ModuleType) -> str:
+
+    digest = hashlib.sha256()
+    for dependency in sorted(dependencies(module), key=lambda m: m.__name__):
+        digest.update(dependency.__name__.encode())
+        digest.update(file_digest(Path(dependency.__file__)).encode())  # type: ignore
+    return digest.hexdigest()
+
+
+def input_path(module: ModuleType, path: str | os.PathLike[str] | None) -> Path:
+    """Resolves an input path the same way the days resolve their own inputs
+
+    Only the default input lives in the day's directory, any other path is
+    opened as given, relative to the current directory.
+    """
+
+    if path is None:
+        return Path(module.__file__).parent / "input.txt"  # type: ignore
+    return Path(path)
+
+
+def load(path: Path) -> Any:
+    return pickle.loads(path.read_bytes())
+
+
+def store(path: Path, value: Any) -> None:
+
+    # Written to a temporary file first so that concurrent runs never read a
+    # partially written entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    temporary.replace(path)
+
+
+def cached_parse_input(
+    module: ModuleType, directory: Path = CACHE_DIRECTORY
+) -> Callable[..., Any]:
+    """Wraps the module's parse_input() with an on-disk cache"""
+
+    parse_input = module.parse_input
+    name = module.__name__.split(".")[1]
+
+    @functools.wraps(parse_input)
+    def wrapper(path: Source | None = None) -> Any:
+
+        # A stream can only be read once, and has no file to key the entry on
+        if path == "-" or not (path is None or isinstance(path, (str, os.PathLike))):
+            return parse_input(path)
+
+        key = f"{file_digest(input_path(module, path))}-{source_digest(module)[:16]}"
+        entry = directory / "inputs" / f"{name}-{key}.pickle"
+        try:
+            return load(entry)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            pass
+
+        parsed = parse_input() if path is None else parse_input(path)
+        store(entry, parsed)
+        return parsed
+
+    return wrapper
+
+
+def day_inputs(module: ModuleType) -> list[Path]:
+    return sorted(Path(module.__file__).parent.glob("input*.txt"))  # type: ignore
+
+
+def result_entry(
+    module: ModuleType, kind: str, inputs: list[Path], directory: Path = CACHE_DIRECTORY
+) -> Path:
+
+    digest = hashlib.sha256(source_digest(module).encode())
+    for path in inputs:
+        digest.update(file_digest(path).encode())
+    name = module.__name__.split(".")[1]
+    return directory / "results" / f"{kind}-{name}-{digest.hexdigest()}.pickle"
+
+
+def cached_result(
+    module: ModuleType,
+    kind: str,
+    inputs: list[Path],
+    solve: Callable[[], Any],
+    directory: Path = CACHE_DIRECTORY,
+) -> tuple[Any, bool]:
+    """Returns the result of solve() and whether it came from the cache
+
+    Only successful results are stored, so a failing solution is always run.
+    The kind tells apart callers that store different results for the same
+    inputs, such as the runner's timings and batch mode's answers.
+    """
+
+    entry = result_entry(module, kind, inputs, directory)
+    try:
+        return load(entry), True
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+
+    result = solve()
+    store(entry, result)
+    return result, False
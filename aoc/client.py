@@ -0,0 +1,154 @@
+"""Client for the solver server started with `python -m aoc.server`
+
+Sends a day and its input to the server and prints the answers. With
+--requests the same input is instead sent over and over from --concurrency
+connections at once, and the throughput and latencies are reported.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from aoc.server import SOCKET
+
+
+async def ask(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, day: int, data: bytes
+) -> dict[str, Any]:
+
+    header = json.dumps({"day": day, "size": len(data)}).encode()
+    writer.write(header + b"\n" + data)
+    await writer.drain()
+    if not (line := await reader.readline()):
+        raise ConnectionError("the server closed the connection")
+    return json.loads(line)
+
+
+async def solve(path: Path, day: int, data: bytes) -> dict[str, Any]:
+
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        return await ask(reader, writer, day, data)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(
+    path: Path, day: int, data: bytes, requests: int, concurrency: int
+) -> tuple[float, list[float], int]:
+    """Sends the requests over concurrent connections
+
+    Returns the elapsed time, the latency of every request and the number of
+    requests that failed.
+    """
+
+    pending = iter(range(requests))
+    latencies: list[float] = []
+    failed = 0
+
+    async def connection() -> None:
+        nonlocal failed
+        reader, writer = await asyncio.open_unix_connection(path)
+        try:
+            # The connections share the iterator, so each takes the next
+            # request as soon as its previous one is answered
+            for _ in pending:
+                start = time.perf_counter()
+                response = await ask(reader, writer, day, data)
+                latencies.append(time.perf_counter() - start)
+                failed += response["error"] is not None
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, failed
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.client",
+        description="Solve a day on a running solver server",
+    )
+    parser.add_argument("day", type=int)
+    parser.add_argument(
+        "input",
+        nargs="?",
+        help="input file, or - for stdin (default: the day's own input)",
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=SOCKET, help=f"socket path (default: {SOCKET})"
+    )
+    parser.add_argument(
+        "-n",
+        "--requests",
+        type=int,
+        help="measure the throughput of this many requests instead of printing "
+        "the answers",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="connections sending requests at once when measuring (default: 4)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.input == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        default = Path(__file__).parent / f"day{args.day}" / "input.txt"
+        try:
+            data = Path(args.input or default).read_bytes()
+        except OSError as e:
+            # Reported like the errors the server sends back for a request
+            print(f"{type(e).__name__}: {e}", file=sys.stderr)
+            return 1
+
+    try:
+        if args.requests:
+            elapsed, latencies, failed = asyncio.run(
+                load_test(args.socket, args.day, data, args.requests, args.concurrency)
+            )
+        else:
+            response = asyncio.run(solve(args.socket, args.day, data))
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(
+            f"No server at {args.socket}, start one with python -m aoc.server",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.requests:
+        latencies.sort()
+        print(
+            f"{len(latencies)} requests in {elapsed:.3f} s over {args.concurrency} "
+            f"connections, {len(latencies) / elapsed:.1f} requests/s, "
+            f"latency median {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p95 {latencies[int(0.95 * (len(latencies) - 1))] * 1000:.2f} ms, "
+            f"{failed} failed"
+        )
+        return 1 if failed else 0
+
+    if response["error"]:
+        print(response["error"], file=sys.stderr)
+        return 1
+    for number, answer in enumerate(response["answers"], 1):
+        print(f"Part {number}: {answer}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Empirical complexity checks for the core functions
+
+Each check times a core function on generated inputs of a geometric series of
+sizes and fits the exponent k of its growth t ~ n^k as the median slope
+between the points on a log-log scale, so one point slowed down by a busy
+machine barely moves it. A check fails when the fitted exponent is clearly
+above the one the algorithm should have in every one of a few attempts, which
+catches regressions that only show up at sizes a single benchmark never
+reaches.
+
+Deep checks use inputs that grow deeper rather than wider, with a path step,
+a fold or a level of nesting per unit of size. They reach sizes far beyond
+the recursion limit, so they also check that the solvers of those days do
+not recurse.
+"""
+import argparse
+import math
+import statistics
+import sys
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable
+
+from aoc.bench import Case, core_cases, measure, phase_cases
+from aoc.generate import write
+from aoc.runner import load
+
+
+@dataclass(frozen=True)
+class Check:
+
+    case: str
+    sizes: tuple[int, ...]
+    exponent: float
+    # Takes the problem size from the result instead of the generator size,
+    # for functions whose work depends on how much they find
+    scale: Callable[[Any], int] | None = None
+    tolerance: float = 0.3
+    deep: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.case} (deep)" if self.deep else self.case
+
+
+# The smallest size of every check takes at least about 50 ms, so that the
+# noise of a loaded machine is small next to the time being measured
+CHECKS = [
+    Check("day4.bingo", (8000, 16000, 32000, 64000), 1.0),
+    # The sets of points outgrow the CPU caches long before the grid is full
+    Check("day5.intersections", (1000, 2000, 4000, 8000), 1.0, tolerance=0.5),
+    # The number of paths grows erratically with the number of caves, but
+    # the time per path should not
+    Check("day12.paths", (22, 24, 26, 28), 1.0, scale=lambda count: count),
+    # The generated grid has n * n cells
+    Check("day15.lowest_risk", (200, 280, 400, 560), 2.0),
+    # Every cuboid can split all the pieces left by the ones before it
+    Check("day22.split_cuboids", (160, 226, 320, 452), 3.0),
+    Check("day12.part2", (32000, 64000, 128000, 256000), 1.0, deep=True),
+    Check("day13.part2", (2000, 4000, 8000, 16000), 1.0, deep=True),
+    # The counts double with every step, so adding them takes longer and
+    # longer as well
+    Check("day14.polymerize", (1000, 2000, 4000, 8000), 1.5),
+    Check("day16.part2", (8000, 16000, 32000, 64000), 1.0, deep=True),
+    # The magnitude gains a digit every few levels, so the arithmetic on it
+    # takes longer and longer as well
+    Check("day18.part1", (16000, 32000, 64000, 128000), 1.5, deep=True),
+]
+
+
+def polymerize(template: str, rules: dict[str, str]) -> int:
+    """Polymerizes the start of the template for as many steps as it is long"""
+
+    return load(14).polymerize(template[:2], rules, len(template))
+
+
+def check_cases() -> dict[str, Case]:
+
+    # Generated inputs are never worth keeping in the input cache
+    cases = core_cases(input_cache=False)
+    for day in sorted({int(check.case.split(".")[0][3:]) for check in CHECKS}):
+        cases += phase_cases(day, input_cache=False)
+    day14 = load(14)
+    cases.append(
+        Case(
+            "day14.polymerize",
+            14,
+            lambda path: day14.parse_input(path),
+            polymerize,
+        )
+    )
+    return {case.name: case for case in cases}
+
+
+@dataclass(frozen=True)
+class Fit:
+
+    check: Check
+    points: list[tuple[int, float]]
+    exponent: float
+
+    @property
+    def ok(self) -> bool:
+        return self.exponent <= self.check.exponent + self.check.tolerance
+
+
+def growth(points: list[tuple[int, float]]) -> float:
+    """Median slope between every two points on a log-log scale"""
+
+    logs = [(math.log(size), math.log(time)) for size, time in points]
+    return statistics.median(
+        (t2 - t1) / (n2 - n1) for (n1, t1), (n2, t2) in combinations(logs, 2)
+    )
+
+
+def run_check(check: Check, case: Case, repeat: int, seed: int, directory: Path) -> Fit:
+    """Times the case at every size, using the fastest run as the least noisy"""
+
+    points = []
+    for size in check.sizes:
+        path = directory / f"day{case.day}-{size}.txt"
+        write(case.day, size, path, seed, check.deep)
+        result = measure(case, repeat, 1, path)
+        if check.scale:
+            size = check.scale(case.function(*case.setup(path)))
+        points.append((size, result.min))
+    return Fit(check, points, growth(points))
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.complexity",
+        description="Check how the run time of core functions grows with the input",
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        help="checks to run, e.g. day4 or day15.lowest_risk (default: all)",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "--attempts",
+        type=int,
+        default=3,
+        help="times to run a check before its growth counts as a failure "
+        "(default: 3)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for generated inputs (default: 0)"
+    )
+    parser.add_argument("--list", action="store_true", help="list available checks")
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    checks = [
+        check
+        for check in CHECKS
+        if not args.checks
+        or any(check.case == p or check.case.startswith(f"{p}.") for p in args.checks)
+    ]
+
+    if args.list:
+        print("\n".join(check.name for check in checks))
+        return 0
+    if not checks:
+        print(f"No checks match {' '.join(args.checks)}", file=sys.stderr)
+        return 2
+
+    cases = check_cases()
+    fits = []
+
+    print(f"{'check':<28} {'sizes':>20} {'expected':>9} {'fitted':>7}  status")
+    with TemporaryDirectory() as directory:
+        for check in checks:
+            for _ in range(max(1, args.attempts)):
+                fit = run_check(
+                    check, cases[check.case], args.repeat, args.seed, Path(directory)
+                )
+                if fit.ok:
+                    break
+            fits.append(fit)
+            sizes = [size for size, _ in fit.points]
+            span = f"{min(sizes)}..{max(sizes)}"
+            print(
+                f"{check.name:<28} {span:>20} {check.exponent:>9.1f} "
+                f"{fit.exponent:>7.2f}  {'ok' if fit.ok else 'FAILED'}",
+                flush=True,
+            )
+
+    if failed := [fit for fit in fits if not fit.ok]:
+        print("\nGrowth beyond the expected exponent:", file=sys.stderr)
+        for fit in failed:
+            times = ", ".join(f"n={size}: {time:.4f} s" for size, time in fit.points)
+            print(f"  {fit.check.name}: {times}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
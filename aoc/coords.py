@@ -0,0 +1,50 @@
+"""Coordinates packed into single integers
+
+A point (x, y) is stored as x + y * SPAN and a point (x, y, z) as
+x + y * SPAN + z * SPAN ** 2. The packing is linear, so adding or
+subtracting packed points adds or subtracts their coordinates, and points
+can be hashed, compared and stored in sets without allocating an object for
+each of them. Every coordinate has to stay within [-SPAN / 2, SPAN / 2).
+"""
+
+SPAN = 1 << 20
+HALF = SPAN >> 1
+PLANE = SPAN * SPAN
+
+UP = -SPAN
+RIGHT = 1
+DOWN = SPAN
+LEFT = -1
+
+ORTHOGONAL = (UP, RIGHT, DOWN, LEFT)
+
+
+def pack(x: int, y: int) -> int:
+    return x + y * SPAN
+
+
+def unpack(point: int) -> tuple[int, int]:
+    y = (point + HALF) // SPAN
+    return point - y * SPAN, y
+
+
+def x_of(point: int) -> int:
+    return (point + HALF) % SPAN - HALF
+
+
+def y_of(point: int) -> int:
+    return (point + HALF) // SPAN
+
+
+def pack3(x: int, y: int, z: int) -> int:
+    return x + y * SPAN + z * PLANE
+
+
+def unpack3(point: int) -> tuple[int, int, int]:
+    z = (point + HALF + HALF * SPAN) // PLANE
+    x, y = unpack(point - z * PLANE)
+    return x, y, z
+
+
+def neighbours(point: int) -> tuple[int, int, int, int]:
+    return (point + UP, point + RIGHT, point + DOWN, point + LEFT)
@@ -1,17 +1,76 @@
+from __future__ import annotations
+from array import array
+from itertools import islice, tee
+from operator import lt
 from pathlib import Path
+from typing import Iterable, Iterator, Sequence
 
+from aoc.backends import kernel, numpy
+from aoc.parsing import Source, lines
 
-def parse_input() -> list[int]:
-    return [
-        int(depth)
-        for depth in (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ]
+# Readings are converted for NumPy this many at a time when streamed
+BATCH = 1 << 16
 
 
-def count_increases(values: list[int], offset: int) -> int:
-    return sum(
-        int(second - first > 0) for first, second in zip(values, values[offset:])
-    )
+def depths(source: Source) -> Iterator[int]:
+    """The depth readings of the input, one at a time"""
+
+    return map(int, filter(None, lines(source)))
+
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> array[int]:
+    # Eight bytes a reading instead of a pointer to a boxed int
+    return array("q", depths(source))
+
+
+@kernel
+def count_increases(depths: Iterable[int], offset: int) -> int:
+    """Counts readings deeper than the one offset readings before them
+
+    The depths may be a stream of any length. Only the readings between the
+    two tee iterators are buffered, so memory stays constant for the window.
+    """
+
+    if offset < 0:
+        raise ValueError("the offset must not be negative")
+    previous, current = tee(depths)
+    next(islice(current, offset, offset), None)
+    return sum(map(lt, previous, current))
+
+
+@count_increases.numpy
+def vectorised_count_increases(depths: Iterable[int], offset: int) -> int:
+
+    if offset < 0:
+        raise ValueError("the offset must not be negative")
+    if offset == 0:
+        # No reading is deeper than itself, and readings[:-0] would be empty
+        return 0
+
+    if isinstance(depths, (Sequence, numpy.ndarray)):
+        # Arrays are viewed rather than copied
+        readings = numpy.asarray(depths)
+        return int(numpy.count_nonzero(readings[offset:] > readings[:-offset]))
+
+    stream = iter(depths)
+    window = numpy.fromiter(islice(stream, offset), "q")
+    count = 0
+    while len(batch := numpy.fromiter(islice(stream, BATCH), "q")):
+        # Carry the last offset readings over to compare them with the batch
+        window = numpy.concatenate((window[-offset:], batch))
+        count += int(numpy.count_nonzero(window[offset:] > window[:-offset]))
+    return count
+
+
+def part1(measurements: Sequence[int]) -> int:
+    return count_increases(measurements, offset=1)
+
+
+def part2(measurements: Sequence[int]) -> int:
+    return count_increases(measurements, offset=3)
+
+
+ANSWERS = (1374, 1418)
 
 
 def solve() -> None:
@@ -19,10 +78,10 @@ def solve() -> None:
     measurements = parse_input()
 
     # First part
-    assert count_increases(measurements, offset=1) == 1374
+    assert part1(measurements) == ANSWERS[0]
 
     # Second part
-    assert count_increases(measurements, offset=3) == 1418
+    assert part2(measurements) == ANSWERS[1]
 
 
 if __name__ == "__main__":
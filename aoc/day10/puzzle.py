@@ -1,20 +1,19 @@
 from pathlib import Path
 
+from aoc.parsing import Source, lines
 
-def parse_input() -> list[list[str]]:
-    return [
-        list(line)
-        for line in (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ]
+PAIRS = {ord(opening): ord(closing) for opening, closing in ("()", "[]", "{}", "<>")}
+SYNTAX_POINTS = {ord(")"): 3, ord("]"): 57, ord("}"): 1197, ord(">"): 25137}
+AUTOCOMPLETE_POINTS = {ord(")"): 1, ord("]"): 2, ord("}"): 3, ord(">"): 4}
 
 
-def solve() -> None:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[bytes]:
+    # Bytes take a byte a bracket, where a list of strings takes a pointer
+    return [line for line in lines(source) if line]
 
-    lines = parse_input()
 
-    bracket_pairs = {"{": "}", "(": ")", "<": ">", "[": "]"}
-    syntax_points = {")": 3, "]": 57, "}": 1197, ">": 25137}
-    autocomplete_points = {")": 1, "]": 2, "}": 3, ">": 4}
+def scores(lines: list[bytes]) -> tuple[list[int], list[int]]:
+    """Syntax error scores of corrupted lines and completion scores of the rest"""
 
     syntax_scores = []
     autocomplete_scores = []
@@ -22,24 +21,48 @@ def solve() -> None:
     for line in lines:
         stack = []
         for bracket in line:
-            if bracket in bracket_pairs:
+            if bracket in PAIRS:
                 stack.append(bracket)
-            elif bracket_pairs[stack.pop()] != bracket:
-                syntax_scores.append(syntax_points[bracket])
+            elif PAIRS[stack.pop()] != bracket:
+                syntax_scores.append(SYNTAX_POINTS[bracket])
                 break
         else:
             line_score = 0
             for bracket in reversed(stack):
-                line_score = (
-                    line_score * 5 + autocomplete_points[bracket_pairs[bracket]]
-                )
+                line_score = line_score * 5 + AUTOCOMPLETE_POINTS[PAIRS[bracket]]
             autocomplete_scores.append(line_score)
 
+    return syntax_scores, autocomplete_scores
+
+
+def prepare(lines: list[bytes]) -> tuple[list[int], list[int]]:
+    """Scores every line once, since each part needs one of the two lists"""
+
+    return scores(lines)
+
+
+def part1(scored: tuple[list[int], list[int]]) -> int:
+    syntax_scores, _ = scored
+    return sum(syntax_scores)
+
+
+def part2(scored: tuple[list[int], list[int]]) -> int:
+    _, autocomplete_scores = scored
+    return sorted(autocomplete_scores)[len(autocomplete_scores) // 2]
+
+
+ANSWERS = (311895, 2904180541)
+
+
+def solve() -> None:
+
+    scored = prepare(parse_input())
+
     # First part
-    assert sum(syntax_scores) == 311895
+    assert part1(scored) == ANSWERS[0]
 
     # Second part
-    assert sorted(autocomplete_scores)[len(autocomplete_scores) // 2] == 2904180541
+    assert part2(scored) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,82 +1,101 @@
 from collections import deque
-from typing import Iterable, Deque
+from itertools import islice
+from typing import Deque, Iterator
 from pathlib import Path
 
-Grid = list[list[int]]
-Point = tuple[int, int]
+from aoc.backends import cells, kernel, numpy
+from aoc.grid import ADJACENT, DIGITS, Grid
+from aoc.parsing import Source, text
 
 
-def parse_input() -> Grid:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Grid:
+    return Grid.parse(text(source), DIGITS)
 
-    return [
-        [int(col) for col in row]
-        for row in (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ]
 
+@kernel
+def flashes(grid: Grid) -> Iterator[int]:
+    """Yields the number of octopuses that flash in each step, forever"""
 
-def neighbours(point: Point, grid: Grid) -> Iterable[Point]:
+    grid = grid.copy()
+    cells = grid.cells
+    offsets = grid.offsets(ADJACENT)
+    octopuses = list(grid.indices())
 
-    for x, y in [
-        (0, -1),
-        (1, -1),
-        (1, 0),
-        (1, 1),
-        (0, 1),
-        (-1, 1),
-        (-1, 0),
-        (-1, -1),
-    ]:
-        nx = point[0] + x
-        ny = point[1] + y
-        if not 0 <= nx < len(grid):
-            continue
-        if not 0 <= ny < len(grid):
-            continue
-        yield (nx, ny)
+    while True:
 
+        will_flash: Deque[int] = deque()
 
-def solve() -> None:
+        for octopus in octopuses:
+            cells[octopus] += 1
+            if cells[octopus] > 9:
+                will_flash.append(octopus)
 
-    grid = parse_input()
-    flashes = 0
-    flashes_at_step: list[int] = []
+        flashed: set[int] = set()
+        while will_flash:
+            octopus = will_flash.popleft()
+            if octopus in flashed:
+                continue
+            flashed.add(octopus)
+            for offset in offsets:
+                neighbour = octopus + offset
+                if cells[neighbour] == grid.border:
+                    continue
+                cells[neighbour] += 1
+                if cells[neighbour] > 9 and neighbour not in flashed:
+                    will_flash.append(neighbour)
+
+        yield len(flashed)
+
+        # Every octopus with an energy level above 9 has flashed
+        for octopus in flashed:
+            cells[octopus] = 0
+
+
+@flashes.numpy
+def vectorised_flashes(grid: Grid) -> Iterator[int]:
+
+    energy = cells(grid).astype(numpy.int16)
+    height, width = energy.shape
 
     while True:
 
-        will_flash: Deque[Point] = deque()
+        energy += 1
+        flashed = numpy.zeros(energy.shape, dtype=bool)
+        while (flashing := (energy > 9) & ~flashed).any():
+            flashed |= flashing
+            # Each flash raises the energy of the octopuses around it
+            padded = numpy.pad(flashing, 1).astype(numpy.int16)
+            for x, y in ADJACENT:
+                energy += padded[1 + y : 1 + y + height, 1 + x : 1 + x + width]
 
-        for y in range(len(grid)):
-            for x in range(len(grid[y])):
-                grid[y][x] += 1
-                if grid[y][x] > 9:
-                    will_flash.append((x, y))
+        yield int(flashed.sum())
 
-        flashed: set[Point] = set()
-        while will_flash:
-            x, y = will_flash.popleft()
-            if (x, y) in flashed:
-                continue
-            flashed.add((x, y))
-            for nx, ny in neighbours((x, y), grid):
-                grid[ny][nx] += 1
-                if grid[ny][nx] > 9 and (nx, ny) not in flashed:
-                    will_flash.append((nx, ny))
-        flashes += len(flashed)
-        flashes_at_step.append(flashes)
-
-        if len(flashed) == len(grid) ** 2:
-            break
-
-        for y in range(len(grid)):
-            for x in range(len(grid)):
-                if grid[y][x] > 9:
-                    grid[y][x] = 0
+        energy[flashed] = 0
+
+
+def part1(grid: Grid) -> int:
+    return sum(islice(flashes(grid), 100))
+
+
+def part2(grid: Grid) -> int:
+    for step, flashed in enumerate(flashes(grid), 1):
+        if flashed == len(grid):
+            return step
+    raise AssertionError("unreachable")
+
+
+ANSWERS = (1739, 324)
+
+
+def solve() -> None:
+
+    grid = parse_input()
 
     # First part
-    assert flashes_at_step[100] == 1739
+    assert part1(grid) == ANSWERS[0]
 
     # Second part
-    assert len(flashes_at_step) == 324
+    assert part2(grid) == ANSWERS[1]
 
 
 if __name__ == "__main__":
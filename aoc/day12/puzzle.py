@@ -1,29 +1,55 @@
 from collections import defaultdict
 from pathlib import Path
+from typing import Iterator
+
+from aoc.parsing import Source, text
 
 
 Graph = dict[str, list[str]]
 
 
-def parse_input() -> Graph:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Graph:
     graph: Graph = defaultdict(list)
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
+    for line in text(source).splitlines():
         start, end = line.split("-")
         graph[start].append(end)
         graph[end].append(start)
     return graph
 
 
+# A cave on the path being explored, the iterator over the caves it leads to
+# that have not been tried yet, whether entering it marked it as visited, and
+# the small cave visited twice so far, if any
+Frame = tuple[str, Iterator[str], bool, str]
+
+
 def paths(caves: Graph, path: list[str], visited: set[str]) -> int:
+    """Number of ways to extend the path to the end, visiting small caves once
+
+    The search backtracks over a single visited set with an explicit stack,
+    so a path may be as long as there are caves.
+    """
 
     if path[-1] == "end":
         return 1
 
     path_count = 0
-    for cave in caves[path[-1]]:
-        if cave.islower() and cave in visited:
-            continue
-        path_count += paths(caves, path + [cave], visited | {cave})
+    visited = set(visited)
+    stack: list[Frame] = [(path[-1], iter(caves[path[-1]]), False, "")]
+    while stack:
+        cave, neighbours, entered, _ = stack[-1]
+        for neighbour in neighbours:
+            if neighbour == "end":
+                path_count += 1
+            elif not (small := neighbour.islower()) or neighbour not in visited:
+                if small:
+                    visited.add(neighbour)
+                stack.append((neighbour, iter(caves[neighbour]), small, ""))
+                break
+        else:
+            stack.pop()
+            if entered:
+                visited.discard(cave)
 
     return path_count
 
@@ -36,29 +62,51 @@ def paths_using_cave_twice(
         return 1
 
     path_count = 0
-    for cave in caves[path[-1]]:
-        if cave == "start":
-            continue
-        elif cave.islower() and cave in visited:
-            if not twice:
-                path_count += paths_using_cave_twice(
-                    caves, path + [cave], visited | {cave}, cave
-                )
+    visited = set(visited)
+    stack: list[Frame] = [(path[-1], iter(caves[path[-1]]), False, twice)]
+    while stack:
+        cave, neighbours, entered, twice = stack[-1]
+        for neighbour in neighbours:
+            if neighbour == "start":
+                continue
+            if neighbour == "end":
+                path_count += 1
+            elif not (small := neighbour.islower()) or neighbour not in visited:
+                if small:
+                    visited.add(neighbour)
+                stack.append((neighbour, iter(caves[neighbour]), small, twice))
+                break
+            elif not twice:
+                stack.append((neighbour, iter(caves[neighbour]), False, neighbour))
+                break
         else:
-            path_count += paths_using_cave_twice(
-                caves, path + [cave], visited | {cave}, twice
-            )
+            stack.pop()
+            if entered:
+                visited.discard(cave)
+
     return path_count
 
 
+def part1(caves: Graph) -> int:
+    return paths(caves, ["start"], {"start"})
+
+
+def part2(caves: Graph) -> int:
+    return paths_using_cave_twice(caves, ["start"], {"start"})
+
+
+ANSWERS = (3410, 98796)
+
+
 def solve() -> None:
+
     caves = parse_input()
 
     # First part
-    assert paths(caves, ["start"], {"start"}) == 3410
+    assert part1(caves) == ANSWERS[0]
 
     # Second part
-    assert paths_using_cave_twice(caves, ["start"], {"start"}) == 98796
+    assert part2(caves) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -3,29 +3,26 @@ from typing import Literal
 from pathlib import Path
 from textwrap import dedent
 
+from aoc.parsing import Source, chunks, integers, read, records
+
 
 Fold = tuple[Literal["x", "y"], int]
 Point = tuple[int, int]
 
+FOLD = re.compile(rb"fold along ([xy])=(\d+)")
 
-def parse_input() -> tuple[set[Point], list[Fold]]:
 
-    lines = (Path(__file__).parent / "input.txt").read_text().splitlines()
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> tuple[set[Point], list[Fold]]:
 
-    points: set[Point] = set()
-    for i, line in enumerate(lines):
-        if not line:
-            break
-        x, y = line.split(",")
-        points.add((int(x), int(y)))
+    dots, instructions = read(source).split(b"\n\n")
 
-    folds: list[Fold] = []
-    for fold in lines[i + 1 :]:
-        match = re.search(r"fold along ([xy])=(\d+)", fold)
-        assert match
-        axis, value = match.groups()
-        assert axis == "x" or axis == "y"
-        folds.append((axis, int(value)))
+    points: set[Point] = set(chunks(integers(dots), 2))  # type: ignore
+    folds: list[Fold] = [
+        (axis.decode(), int(value))  # type: ignore
+        for axis, value in records(FOLD, instructions)
+    ]
 
     return points, folds
 
@@ -46,43 +43,49 @@ def draw(points: set[Point]) -> str:
 
 def fold(points: set[Point], folds: list[Fold]) -> set[Point]:
 
-    if not folds:
-        return points
-
-    folded: set[Point] = set()
-    axis, length = folds[0]
-
-    for x, y in points:
+    for axis, length in folds:
         if axis == "x":
-            folded.add((x, y) if x < length else ((2 * length - x, y)))
+            points = {(x, y) if x < length else (2 * length - x, y) for x, y in points}
         else:
-            folded.add((x, y) if y < length else (x, 2 * length - y))
+            points = {(x, y) if y < length else (x, 2 * length - y) for x, y in points}
+
+    return points
+
+
+def part1(manual: tuple[set[Point], list[Fold]]) -> int:
+    points, folds = manual
+    return len(fold(points, folds[:1]))
+
+
+def part2(manual: tuple[set[Point], list[Fold]]) -> str:
+    points, folds = manual
+    return draw(fold(points, folds))
+
 
-    return fold(folded, folds[1:])
+ANSWERS = (
+    765,
+    dedent(
+        """
+        ###..####.#..#.####.#....###...##..#..#
+        #..#....#.#.#.....#.#....#..#.#..#.#..#
+        #..#...#..##.....#..#....#..#.#....####
+        ###...#...#.#...#...#....###..#.##.#..#
+        #.#..#....#.#..#....#....#....#..#.#..#
+        #..#.####.#..#.####.####.#.....###.#..#
+        """
+    ).strip(),
+)
 
 
 def solve() -> None:
 
-    points, folds = parse_input()
+    manual = parse_input()
 
     # First part
-    assert len(fold(points, folds[:1])) == 765
+    assert part1(manual) == ANSWERS[0]
 
     # Second part
-    letters = draw(fold(points, folds))
-    assert (
-        letters
-        == dedent(
-            """
-            ###..####.#..#.####.#....###...##..#..#
-            #..#....#.#.#.....#.#....#..#.#..#.#..#
-            #..#...#..##.....#..#....#..#.#....####
-            ###...#...#.#...#...#....###..#.##.#..#
-            #.#..#....#.#..#....#....#....#..#.#..#
-            #..#.####.#..#.####.####.#.....###.#..#
-            """
-        ).strip()
-    )
+    assert part2(manual) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -2,10 +2,14 @@ from itertools import pairwise
 from collections import defaultdict, Counter
 from pathlib import Path
 
+from aoc.parsing import Source, text
 
-def parse_input() -> tuple[str, dict[str, str]]:
 
-    lines = (Path(__file__).parent / "input.txt").read_text().splitlines()
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> tuple[str, dict[str, str]]:
+
+    lines = text(source).splitlines()
     return lines[0], dict(rule.split(" -> ") for rule in lines[2:])
 
 
@@ -13,31 +17,44 @@ def insert_pairs(
     pairs: dict[str, int], rules: dict[str, str], elements: dict[str, int], step: int
 ) -> int:
 
-    if step == 0:
-        return max(elements.values()) - min(elements.values())
+    for _ in range(step):
+        next_gen_pairs: dict[str, int] = defaultdict(int)
+        for (a, b), count in pairs.items():
+            element = rules[a + b]
+            next_gen_pairs[a + element] += count
+            next_gen_pairs[element + b] += count
+            elements[element] += count
+        pairs = next_gen_pairs
 
-    next_gen_pairs = defaultdict(int)
-    for (a, b), count in pairs.items():
-        element = rules[a + b]
-        next_gen_pairs[a + element] += count
-        next_gen_pairs[element + b] += count
-        elements[element] += count
+    return max(elements.values()) - min(elements.values())
 
-    return insert_pairs(next_gen_pairs, rules, elements, step - 1)
 
+def polymerize(template: str, rules: dict[str, str], steps: int) -> int:
 
-def solve() -> None:
+    pairs = Counter(a + b for a, b in pairwise(template))
+    return insert_pairs(pairs, rules, Counter(template), steps)
 
-    template, rules = parse_input()
 
-    pairs = Counter(a + b for a, b in pairwise(template))
-    elements = Counter(template)
+def part1(instructions: tuple[str, dict[str, str]]) -> int:
+    return polymerize(*instructions, 10)
+
+
+def part2(instructions: tuple[str, dict[str, str]]) -> int:
+    return polymerize(*instructions, 40)
+
+
+ANSWERS = (3411, 7477815755570)
+
+
+def solve() -> None:
+
+    instructions = parse_input()
 
     # First part
-    assert insert_pairs(pairs, rules, elements.copy(), 10) == 3411
+    assert part1(instructions) == ANSWERS[0]
 
     # Second part
-    assert insert_pairs(pairs, rules, elements.copy(), 40) == 7477815755570
+    assert part2(instructions) == ANSWERS[1]
 
 
 if __name__ == "__main__":
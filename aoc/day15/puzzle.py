@@ -1,68 +1,71 @@
-from math import sqrt
-from heapq import heappop, heappush
-from typing import Iterable
 from pathlib import Path
+from typing import Iterator
 
+from aoc import instrument
+from aoc.grid import DIGITS, ORTHOGONAL, Grid
+from aoc.parsing import Source, text
+from aoc.search import INFINITY, SearchStats, dial
 
-Point = tuple[int, int]
-Grid = dict[Point, int]
 
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Grid:
+    # Risk levels are never zero, so a zero border marks the edge of the cave
+    return Grid.parse(text(source), DIGITS, border=0)
 
-def parse_input() -> Grid:
 
-    grid: Grid = {}
-    for y, row in enumerate(
-        (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ):
-        for x, col in enumerate(row):
-            grid[(x, y)] = int(col)
-    return grid
+def lowest_risk(grid: Grid) -> int:
 
+    cells = grid.cells
+    offsets = grid.offsets(ORTHOGONAL)
+    end = grid.index(grid.width - 1, grid.height - 1)
 
-def neighbours(point: Point, grid: Grid) -> Iterable[Point]:
+    def neighbours(point: int) -> Iterator[tuple[int, int]]:
+        for offset in offsets:
+            neighbour = point + offset
+            if risk := cells[neighbour]:
+                yield neighbour, risk
 
-    for x, y in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-        neighbour = (x + point[0], y + point[1])
-        if neighbour in grid:
-            yield neighbour
+    # Risk levels are single digits, which suits a bucket queue
+    costs = [INFINITY] * len(cells)
+    stats = SearchStats()
+    risk = dial(grid.index(0, 0), neighbours, end.__eq__, 9, stats, costs)
+    instrument.count("lowest_risk.expanded", stats.expanded)
+    instrument.count("lowest_risk.stale", stats.stale)
+    instrument.peak("lowest_risk.peak_frontier", stats.peak_frontier)
+    assert risk is not None
+    return risk
 
 
-def lowest_risk(grid: Grid) -> int:
+def tiled_grid(grid: Grid) -> Grid:
 
-    risks = {point: float("inf") for point in grid}
-    risks[(0, 0)] = 0
-    queue = [(0, (0, 0))]
+    tiled = Grid(grid.width * 5, grid.height * 5, border=0)
 
-    while queue:
+    # Each tile increases the risk levels by one, wrapping from 9 back to 1
+    levels = bytes(range(1, 10))
+    increases = [
+        bytes.maketrans(levels, levels[increase:] + levels[:increase])
+        for increase in range(9)
+    ]
+    for y in range(grid.height):
+        row = grid.row(y).tobytes()
+        for tile_y in range(5):
+            tiled_row = tiled.row(tile_y * grid.height + y)
+            for tile_x in range(5):
+                start = tile_x * grid.width
+                tiled_row[start : start + grid.width] = row.translate(
+                    increases[(tile_x + tile_y) % 9]
+                )
+    return tiled
 
-        risk, point = heappop(queue)
-        if risks[point] < risk:
-            continue
 
-        for neighbour in neighbours(point, grid):
-            neighbour_risk = grid[neighbour]
-            cumulative_risk = risk + neighbour_risk
-            if cumulative_risk < risks[neighbour]:
-                risks[neighbour] = cumulative_risk
-                heappush(queue, (cumulative_risk, neighbour))
+def part1(grid: Grid) -> int:
+    return lowest_risk(grid)
 
-    return risks[(max(x for x, _ in grid), max(y for _, y in grid))]
 
+def part2(grid: Grid) -> int:
+    return lowest_risk(tiled_grid(grid))
 
-def tiled_grid(grid: Grid) -> Grid:
 
-    size = int(sqrt(len(grid)))
-    tiled = {}
-    for (x, y), risk in grid.items():
-        for tile_y in range(5):
-            for tile_x in range(5):
-                scaled_point = (size * tile_x + x, size * tile_y + y)
-                tiled[scaled_point] = (
-                    scaled_risk
-                    if (scaled_risk := risk + tile_x + tile_y) <= 9
-                    else scaled_risk - 9
-                )
-    return tiled
+ANSWERS = (403, 2840)
 
 
 def solve() -> None:
@@ -70,10 +73,10 @@ def solve() -> None:
     grid = parse_input()
 
     # First part
-    assert lowest_risk(grid) == 403
+    assert part1(grid) == ANSWERS[0]
 
     # Second part
-    assert lowest_risk(tiled_grid(grid)) == 2840
+    assert part2(grid) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from __future__ import annotations
-import operator
-from functools import reduce
 from dataclasses import dataclass, field
+from math import prod
 from pathlib import Path
+from typing import Callable
+
+from aoc.parsing import Source, text
 
 
 @dataclass
@@ -22,81 +24,116 @@ class OperatorPacket:
     mode: int
 
     packets: list[OperatorPacket | LiteralPacket] = field(default_factory=list)
+    size: int = 0
+
 
-    @property
-    def size(self) -> int:
-        return sum(p.size for p in self.packets) + (18 if self.mode else 22)
+OPERATIONS: dict[int, Callable[[list[int]], int]] = {
+    0: sum,
+    1: prod,
+    2: min,
+    3: max,
+    5: lambda values: int(values[0] > values[1]),
+    6: lambda values: int(values[0] < values[1]),
+    7: lambda values: int(values[0] == values[1]),
+}
 
 
-def parse_input() -> str:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> str:
 
-    packet = (Path(__file__).parent / "input.txt").read_text()
+    packet = text(source).strip()
     return bin(int(packet, 16))[2:].zfill(len(packet) * 4)
 
 
 def decode(bits: str) -> LiteralPacket | OperatorPacket:
-
-    version = int(bits[:3], 2)
-    type = int(bits[3:6], 2)
-
-    payload = bits[6:]
-
-    if type == 4:
-        size = 6
-        number = ""
-        while payload:
-            more = int(payload[0])
-            number += payload[1:5]
-            size += 5
-            if not more:
+    """Decodes the outermost packet in a single pass over the bits
+
+    The operators whose sub-packets are still being read are kept on a stack,
+    along with the bit offset they started at and their limit: the offset
+    their sub-packets end at in length mode, or their number in count mode.
+    """
+
+    position = 0
+    stack: list[tuple[OperatorPacket, int, int]] = []
+    while True:
+        start = position
+        version = int(bits[position : position + 3], 2)
+        type = int(bits[position + 3 : position + 6], 2)
+        position += 6
+
+        packet: LiteralPacket | OperatorPacket | None = None
+        if type == 4:
+            number = 0
+            more = True
+            while more:
+                more = bits[position] == "1"
+                number = number << 4 | int(bits[position + 1 : position + 5], 2)
+                position += 5
+            packet = LiteralPacket(version, type, number, position - start)
+        else:
+            mode = int(bits[position])
+            if mode:
+                limit = int(bits[position + 1 : position + 12], 2)
+                position += 12
+            else:
+                limit = position + 16 + int(bits[position + 1 : position + 16], 2)
+                position += 16
+            stack.append((OperatorPacket(version, type, mode), start, limit))
+
+        # Hand the packet to its operator, and close every operator that has
+        # all of its sub-packets, which may in turn complete its own operator
+        while stack:
+            operator, start, limit = stack[-1]
+            if packet is not None:
+                operator.packets.append(packet)
+            if (len(operator.packets) if operator.mode else position) < limit:
                 break
-            payload = payload[5:]
-        return LiteralPacket(version, type, int(number, 2), size)
-    else:
-        mode = int(payload[0])
-        sub_packets = []
-        if mode:
-            sub_packet_count = int(payload[1:12], 2)
-            sub_packet_bits = payload[12:]
-            while len(sub_packets) < sub_packet_count:
-                sub_packets.append(decode(sub_packet_bits))
-                sub_packet_bits = sub_packet_bits[sub_packets[-1].size :]
+            stack.pop()
+            operator.size = position - start
+            packet = operator
         else:
-            sub_packet_size = int(payload[1:16], 2)
-            sub_packet_bits = payload[16:]
-            while sum(p.size for p in sub_packets) < sub_packet_size:
-                sub_packets.append(decode(sub_packet_bits))
-                sub_packet_bits = sub_packet_bits[sub_packets[-1].size :]
-        return OperatorPacket(
-            version,
-            type,
-            mode,
-            sub_packets,
-        )
+            return packet  # type: ignore
 
 
 def version_sum(packet: LiteralPacket | OperatorPacket) -> int:
 
-    if isinstance(packet, LiteralPacket):
-        return packet.version
-
-    return packet.version + sum(version_sum(p) for p in packet.packets)
+    total = 0
+    stack = [packet]
+    while stack:
+        packet = stack.pop()
+        total += packet.version
+        if isinstance(packet, OperatorPacket):
+            stack += packet.packets
+    return total
 
 
 def visit(packet: LiteralPacket | OperatorPacket) -> int:
+    """Evaluates the packet, computing every operator after its sub-packets"""
+
+    values: list[int] = []
+    stack: list[tuple[LiteralPacket | OperatorPacket, bool]] = [(packet, False)]
+    while stack:
+        packet, ready = stack.pop()
+        if isinstance(packet, LiteralPacket):
+            values.append(packet.value)
+        elif not ready:
+            stack.append((packet, True))
+            stack += [(p, False) for p in reversed(packet.packets)]
+        else:
+            operands = values[len(values) - len(packet.packets) :]
+            del values[len(values) - len(packet.packets) :]
+            values.append(OPERATIONS[packet.type](operands))
+    return values[0]
+
+
+def part1(packet: str) -> int:
+    return version_sum(decode(packet))
+
+
+def part2(packet: str) -> int:
+    return visit(decode(packet))
 
-    if isinstance(packet, LiteralPacket):
-        return packet.value
 
-    return {
-        0: lambda packet: sum(visit(p) for p in packet.packets),
-        1: lambda packet: reduce(operator.mul, (visit(p) for p in packet.packets)),
-        2: lambda packet: min(visit(p) for p in packet.packets),
-        3: lambda packet: max(visit(p) for p in packet.packets),
-        5: lambda packet: int(visit(packet.packets[0]) > visit(packet.packets[1])),
-        6: lambda packet: int(visit(packet.packets[0]) < visit(packet.packets[1])),
-        7: lambda packet: int(visit(packet.packets[0]) == visit(packet.packets[1])),
-    }[packet.type](packet)
+ANSWERS = (940, 13476220616073)
 
 
 def solve() -> None:
@@ -104,10 +141,10 @@ def solve() -> None:
     packet = parse_input()
 
     # First part
-    assert version_sum(decode(packet)) == 940
+    assert part1(packet) == ANSWERS[0]
 
     # Second part
-    assert visit(decode(packet)) == 13476220616073
+    assert part2(packet) == ANSWERS[1]
 
 
 if __name__ == "__main__":
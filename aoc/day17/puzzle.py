@@ -1,49 +1,43 @@
-import re
 from typing import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
+from aoc.coords import pack, unpack, x_of, y_of
+from aoc.parsing import Source, integers, read
 
-@dataclass(frozen=True)
-class Point:
-
-    x: int
-    y: int
+DRAG_AND_GRAVITY = pack(1, 1)
+GRAVITY = pack(0, 1)
 
 
 @dataclass
 class Probe:
 
-    velocity: Point
-    origin: Point = Point(0, 0)
+    velocity: int
+    origin: int = pack(0, 0)
 
-    def apex(self) -> Point:
+    def apex(self) -> int:
 
-        if self.velocity.y < 0:
+        if y_of(self.velocity) < 0:
             return self.origin
 
         for pos, vel in self.shoot():
-            if vel.y == 0:
+            if y_of(vel) == 0:
                 return pos
 
-    def shoot(self) -> Iterable[tuple[Point, Point]]:
+    def shoot(self) -> Iterable[tuple[int, int]]:
 
         pos = self.origin
         vel = self.velocity
 
         while True:
             yield pos, vel
-            pos = Point(pos.x + vel.x, pos.y + vel.y)
-            vel = Point(max(0, vel.x - 1), vel.y - 1)
+            pos += vel
+            vel -= DRAG_AND_GRAVITY if x_of(vel) > 0 else GRAVITY
 
 
-def parse_input() -> Iterable[int]:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[int]:
 
-    bounds = re.search(
-        r"target area: x=(-?\d+)\.\.(-?\d+), y=(-?\d+)\.\.(-?\d+)",
-        (Path(__file__).parent / "input.txt").read_text(),
-    ).groups()
-    return [int(b) for b in bounds]
+    return integers(read(source))
 
 
 def successful_probes(x1: int, x2: int, y1: int, y2: int) -> list[Probe]:
@@ -52,27 +46,38 @@ def successful_probes(x1: int, x2: int, y1: int, y2: int) -> list[Probe]:
 
     for xv in range(x2 + 1):
         for yv in range(y1, abs(y1)):
-            probe = Probe(Point(xv, yv))
+            probe = Probe(pack(xv, yv))
             for pos, vel in probe.shoot():
-                if x1 <= pos.x <= x2 and y1 <= pos.y <= y2:
+                x, y = unpack(pos)
+                if x1 <= x <= x2 and y1 <= y <= y2:
                     probes.append(probe)
                     break
-                if pos.y < y1 or pos.x > x2 or (vel.x == 0 and pos.x < x1):
+                if y < y1 or x > x2 or (x_of(vel) == 0 and x < x1):
                     break
 
     return probes
 
 
+def part1(bounds: list[int]) -> int:
+    return max(y_of(probe.apex()) for probe in successful_probes(*bounds))
+
+
+def part2(bounds: list[int]) -> int:
+    return len(successful_probes(*bounds))
+
+
+ANSWERS = (5151, 968)
+
+
 def solve() -> None:
 
     bounds = parse_input()
-    probes = successful_probes(*bounds)
 
     # First part
-    assert max(probe.apex().y for probe in probes) == 5151
+    assert part1(bounds) == ANSWERS[0]
 
     # Second part
-    assert len(probes) == 968
+    assert part2(bounds) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 from __future__ import annotations
 import itertools
+import re
 from concurrent.futures import ProcessPoolExecutor
-from math import floor, ceil
 from dataclasses import dataclass
 from pathlib import Path
 
+from aoc.parsing import Source, text
+
 
 @dataclass
 class Regular:
@@ -23,135 +25,135 @@ class Pair:
 
     left: Regular | Pair
     right: Regular | Pair
-    should_explode: bool = False
 
     def magnitude(self) -> int:
-        return 3 * self.left.magnitude() + 2 * self.right.magnitude()
-
-    def debug(self) -> str:
-        return f"[{self.left.debug()},{self.right.debug()}]"
-
 
-def parse_input() -> list[str]:
-    return (Path(__file__).parent / "input.txt").read_text().splitlines()
-
-
-def tree(number: list[int] | int) -> Pair | Regular:
+        magnitudes: list[int] = []
+        stack: list[Regular | Pair | None] = [self]
+        while stack:
+            node = stack.pop()
+            # None marks a pair whose both halves have been computed
+            if node is None:
+                right = magnitudes.pop()
+                magnitudes.append(3 * magnitudes.pop() + 2 * right)
+            elif isinstance(node, Regular):
+                magnitudes.append(node.value)
+            else:
+                stack += [None, node.right, node.left]
+        return magnitudes[0]
 
-    if isinstance(number, int):
-        return Regular(number)
+    def debug(self) -> str:
 
-    return Pair(tree(number[0]), tree(number[1]))
+        pieces: list[str] = []
+        stack: list[Regular | Pair | str] = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                pieces.append(node)
+            elif isinstance(node, Regular):
+                pieces.append(str(node.value))
+            else:
+                pieces.append("[")
+                stack += ["]", node.right, ",", node.left]
+        return "".join(pieces)
 
 
-def explode(node: Pair | Regular) -> bool:
+# Where a node hangs in the tree: its parent and which half of it it is
+Slot = tuple[Pair | None, str]
 
-    # FIXME: Using nonlocals is nasty
-    leaves: list[Regular | None] = []
-    exploded_once = False
+TOKENS = re.compile(r"\d+|\]")
 
-    def dfs(node: Pair | Regular, depth: int = 0) -> Pair | None:
 
-        if isinstance(node, Regular):
-            leaves.append(node)
-            return
-
-        if depth == 4 and isinstance(node, Pair):
-            nonlocal exploded_once
-            if not exploded_once:
-                node.should_explode = True
-                exploded_once = True
-                leaves.append(None)
-            else:
-                dfs(node.left)
-                dfs(node.right)
-            return node
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[str]:
+    return text(source).splitlines()
 
-        left = dfs(node.left, depth + 1)
 
-        if isinstance(left, Pair) and left.should_explode:
-            left.should_explode = False
-            node.left = Regular(0)
+def tree(number: str) -> Pair | Regular:
+    """Builds the tree of a snailfish number, however deeply it is nested
 
-        right = dfs(node.right, depth + 1)
+    Every closing bracket joins the two nodes before it into a pair, so only
+    the numbers and closing brackets have to be read.
+    """
 
-        if isinstance(right, Pair) and right.should_explode:
-            right.should_explode = False
-            node.right = Regular(0)
+    nodes: list[Pair | Regular] = []
+    for token in TOKENS.findall(number):
+        if token == "]":
+            right = nodes.pop()
+            nodes.append(Pair(nodes.pop(), right))
+        else:
+            nodes.append(Regular(int(token)))
+    return nodes[0]
 
-        return left or right
 
-    exploded_node = dfs(node)
-    if not exploded_node:
-        return False
+def explode(node: Pair | Regular) -> bool:
+    """Explodes the leftmost pair of regular numbers nested inside four pairs
 
-    previous = leaves.index(None) - 1
-    next = leaves.index(None) + 1
-    if previous >= 0:
-        leaves[previous].value += exploded_node.left.value
-    if next < len(leaves):
-        leaves[next].value += exploded_node.right.value
+    The tree is walked in order with an explicit stack, so the regular number
+    to the left of the exploding pair is the last one seen, and the one to its
+    right is the leftmost number of the next subtree on the stack.
+    """
 
-    return True
+    previous: Regular | None = None
+    stack: list[tuple[Pair | Regular, int, Slot]] = [(node, 0, (None, ""))]
+    while stack:
+        node, depth, (parent, half) = stack.pop()
+        if isinstance(node, Regular):
+            previous = node
+        elif (
+            depth >= 4
+            and isinstance(node.left, Regular)
+            and isinstance(node.right, Regular)
+        ):
+            if previous:
+                previous.value += node.left.value
+            if stack:
+                following = stack[-1][0]
+                while isinstance(following, Pair):
+                    following = following.left
+                following.value += node.right.value
+            setattr(parent, half, Regular(0))
+            return True
+        else:
+            stack += [
+                (node.right, depth + 1, (node, "right")),
+                (node.left, depth + 1, (node, "left")),
+            ]
+    return False
 
 
 def split(node: Pair | Regular) -> bool:
+    """Splits the leftmost regular number of 10 or more into a pair"""
 
-    # FIXME: Using a nonlocal is nasty
-    split_once = False
-
-    def dfs(node: Pair | Regular) -> bool:
-
-        nonlocal split_once
+    stack: list[tuple[Pair | Regular, Slot]] = [(node, (None, ""))]
+    while stack:
+        node, (parent, half) = stack.pop()
+        if isinstance(node, Pair):
+            stack += [(node.right, (node, "right")), (node.left, (node, "left"))]
+        elif parent and node.value >= 10:
+            halves = Pair(Regular(node.value // 2), Regular((node.value + 1) // 2))
+            setattr(parent, half, halves)
+            return True
+    return False
 
-        if isinstance(node, Regular):
-            return node.value >= 10
-
-        if dfs(node.left):
-            if not split_once:
-                value = node.left.value / 2
-                node.left = Pair(Regular(floor(value)), Regular(ceil(value)))
-                split_once = True
-        elif dfs(node.right):
-            if not split_once:
-                value = node.right.value / 2
-                node.right = Pair(Regular(floor(value)), Regular(ceil(value)))
-                split_once = True
 
-        return False
+def add(first: str, second: str) -> Pair | Regular:
 
-    dfs(node)
-    return split_once
+    pair = Pair(tree(first), tree(second))
+    while explode(pair) or split(pair):
+        pass
+    return pair
 
 
 def final_sum(numbers: list[str]) -> int:
 
     first = numbers[0]
     for second in numbers[1:]:
-        pair = Pair(tree(eval(first)), tree(eval(second)))
-        while True:
-            pair = tree(eval(pair.debug()))
-            if explode(pair):
-                continue
-            if split(pair):
-                continue
-            break
-        first = pair.debug()
-    return tree(eval(first)).magnitude()
+        first = add(first, second).debug()
+    return tree(first).magnitude()
 
 
 def reduce(numbers: tuple[str, str]) -> int:
-
-    first, second = numbers
-    pair = Pair(tree(eval(first)), tree(eval(second)))
-    while True:
-        pair = tree(eval(pair.debug()))
-        if explode(pair):
-            continue
-        if split(pair):
-            continue
-        break
-    return pair.magnitude()
+    return add(*numbers).magnitude()
 
 
 def max_magnitude(numbers: list[str]) -> int:
@@ -163,15 +165,26 @@ def max_magnitude(numbers: list[str]) -> int:
     return max(magnitudes)
 
 
+def part1(numbers: list[str]) -> int:
+    return final_sum(numbers)
+
+
+def part2(numbers: list[str]) -> int:
+    return max_magnitude(numbers)
+
+
+ANSWERS = (4137, 4573)
+
+
 def solve() -> None:
 
     numbers = parse_input()
 
     # First part
-    assert final_sum(numbers) == 4137
+    assert part1(numbers) == ANSWERS[0]
 
     # Second part
-    assert max_magnitude(numbers) == 4573
+    assert part2(numbers) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,57 +1,54 @@
 from __future__ import annotations
 from pathlib import Path
 from itertools import combinations
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass, field
 
+from aoc import instrument
+from aoc.coords import pack3, unpack3
+from aoc.parsing import Source, chunks, integers, read
 
-@dataclass(frozen=True)
-class Vector:
-
-    x: int
-    y: int
-    z: int
-
-    def __add__(self, v: Vector) -> Vector:
-        return Vector(self.x + v.x, self.y + v.y, self.z + v.z)
-
-    def __sub__(self, v: Vector) -> Vector:
-        return Vector(self.x - v.x, self.y - v.y, self.z - v.z)
-
-    def manhattan(self, v: Vector) -> int:
-        difference = self - v
-        return abs(difference.x) + abs(difference.y) + abs(difference.z)
-
-    def mag(self) -> int:
-        return self.x ** 2 + self.y ** 2 + self.z ** 2
+Row = tuple[int, int, int]
 
 
 @dataclass(frozen=True)
 class Matrix:
 
-    top: Vector
-    mid: Vector
-    bot: Vector
+    top: Row
+    mid: Row
+    bot: Row
+
+    def __mul__(self, vec: int) -> int:
+        x, y, z = unpack3(vec)
+        return pack3(
+            self.top[0] * x + self.top[1] * y + self.top[2] * z,
+            self.mid[0] * x + self.mid[1] * y + self.mid[2] * z,
+            self.bot[0] * x + self.bot[1] * y + self.bot[2] * z,
+        )
 
-    def __mul__(self, vec: Vector) -> Vector:
-        return Vector(
-            self.top.x * vec.x + self.top.y * vec.y + self.top.z * vec.z,
-            self.mid.x * vec.x + self.mid.y * vec.y + self.mid.z * vec.z,
-            self.bot.x * vec.x + self.bot.y * vec.y + self.bot.z * vec.z,
+    def __matmul__(self, other: Matrix) -> Matrix:
+        columns = list(zip(other.top, other.mid, other.bot))
+        top, mid, bot = (
+            tuple(sum(a * b for a, b in zip(row, column)) for column in columns)
+            for row in (self.top, self.mid, self.bot)
         )
+        return Matrix(top, mid, bot)  # type: ignore
 
 
 @dataclass
 class Scanner:
 
     id: int
-    beacons: set[Vector] = field(default_factory=set)
-    position: Vector = Vector(0, 0, 0)
+    beacons: set[int] = field(default_factory=set)
+    position: int = pack3(0, 0, 0)
 
     def distances(self) -> list[set[int]]:
+        beacons = [unpack3(beacon) for beacon in self.beacons]
         distances = []
-        for beacon in self.beacons:
-            distances.append({(beacon - b).mag() for b in self.beacons})
+        for x, y, z in beacons:
+            distances.append(
+                {(x - a) ** 2 + (y - b) ** 2 + (z - c) ** 2 for a, b, c in beacons}
+            )
         return distances
 
     def overlaps(self, other: Scanner) -> bool:
@@ -64,64 +61,55 @@ class Scanner:
         return False
 
 
-def parse_input() -> list[Scanner]:
-
-    scanners: list[Scanner] = []
-
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
-        if not line:
-            continue
-        if line.startswith("---"):
-            scanners.append(Scanner(len(scanners)))
-        else:
-            beacon = Vector(*[int(v) for v in line.split(",")])
-            scanners[-1].beacons.add(beacon)
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> list[Scanner]:
 
+    scanners = []
+    for number, block in enumerate(read(source).strip().split(b"\n\n")):
+        # The header would otherwise be read as a beacon coordinate
+        _, _, beacons = block.partition(b"\n")
+        scanners.append(
+            Scanner(number, {pack3(*beacon) for beacon in chunks(integers(beacons), 3)})
+        )
     return scanners
 
 
 directions = [
-    Matrix(Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)),
-    Matrix(Vector(0, 1, 0), Vector(-1, 0, 0), Vector(0, 0, 1)),
-    Matrix(Vector(-1, 0, 0), Vector(0, -1, 0), Vector(0, 0, 1)),
-    Matrix(Vector(0, -1, 0), Vector(1, 0, 0), Vector(0, 0, 1)),
-    Matrix(Vector(1, 0, 0), Vector(0, 0, -1), Vector(0, 1, 0)),
-    Matrix(Vector(1, 0, 0), Vector(0, 0, 1), Vector(0, -1, 0)),
+    Matrix((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    Matrix((0, 1, 0), (-1, 0, 0), (0, 0, 1)),
+    Matrix((-1, 0, 0), (0, -1, 0), (0, 0, 1)),
+    Matrix((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+    Matrix((1, 0, 0), (0, 0, -1), (0, 1, 0)),
+    Matrix((1, 0, 0), (0, 0, 1), (0, -1, 0)),
 ]
 rotations = [
-    Matrix(Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)),
-    Matrix(Vector(0, 0, -1), Vector(0, 1, 0), Vector(1, 0, 0)),
-    Matrix(Vector(-1, 0, 0), Vector(0, 1, 0), Vector(0, 0, -1)),
-    Matrix(Vector(0, 0, 1), Vector(0, 1, 0), Vector(-1, 0, 0)),
+    Matrix((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    Matrix((0, 0, -1), (0, 1, 0), (1, 0, 0)),
+    Matrix((-1, 0, 0), (0, 1, 0), (0, 0, -1)),
+    Matrix((0, 0, 1), (0, 1, 0), (-1, 0, 0)),
 ]
+orientations = [rotate @ orient for orient in directions for rotate in rotations]
 
 
 def align(origin: Scanner, scanner: Scanner) -> Scanner | None:
 
-    if not origin.overlaps(scanner):
-        return
-
-    for orient in directions:
-        for rotate in rotations:
-
-            beacons = {rotate * (orient * beacon) for beacon in scanner.beacons}
-
-            distances = {
-                "x": defaultdict(int),
-                "y": defaultdict(int),
-                "z": defaultdict(int),
-            }
-            for b1 in beacons:
-                for b2 in origin.beacons:
-                    for axis in "xyz":
-                        distances[axis][getattr(b1, axis) - getattr(b2, axis)] += 1
-            offsets = []
-            for axis, dists in distances.items():
-                for dist, beacon_pairs in dists.items():
-                    if beacon_pairs >= 12:
-                        offsets.append(dist)
-            if len(offsets) == 3:
-                offset = Vector(*offsets)
+    instrument.count("align.candidates")
+    with instrument.timer("align.overlaps"):
+        if not origin.overlaps(scanner):
+            return
+    instrument.count("align.overlapping")
+
+    with instrument.timer("align.orientations"):
+        for orientation in orientations:
+
+            beacons = {orientation * beacon for beacon in scanner.beacons}
+
+            # Packed beacons subtract like vectors, so the offset between the
+            # scanners is the difference shared by at least twelve beacon pairs
+            offsets = Counter(b1 - b2 for b1 in beacons for b2 in origin.beacons)
+            offset, beacon_pairs = offsets.most_common(1)[0]
+            if beacon_pairs >= 12:
                 return Scanner(
                     scanner.id,
                     {b - offset for b in beacons},
@@ -129,13 +117,11 @@ def align(origin: Scanner, scanner: Scanner) -> Scanner | None:
                 )
 
 
-def align_scanners(scanners: dict[int, Scanner]) -> dict[int, Scanner]:
+def align_scanners(scanners: list[Scanner]) -> dict[int, Scanner]:
 
     aligned: dict[int, Scanner] = {0: scanners[0]}
     unaligned: dict[int, Scanner] = {
-        scanner.id: scanner
-        for scanner in scanners.values()
-        if scanner.id not in aligned
+        scanner.id: scanner for scanner in scanners if scanner.id not in aligned
     }
     explored: set[int] = set()
 
@@ -156,24 +142,40 @@ def align_scanners(scanners: dict[int, Scanner]) -> dict[int, Scanner]:
     return aligned
 
 
-def solve() -> None:
+def prepare(scanners: list[Scanner]) -> list[Scanner]:
+    """Aligns the scanners once, since both parts need them aligned"""
 
-    scanners = {scanner.id: scanner for scanner in parse_input()}
+    return list(align_scanners(scanners).values())
 
-    aligned_scanners = align_scanners(scanners)
 
-    # First part
-    beacons: set[Vector] = set()
-    for scanner in aligned_scanners.values():
+def part1(scanners: list[Scanner]) -> int:
+
+    beacons: set[int] = set()
+    for scanner in scanners:
         beacons.update(scanner.beacons)
-    assert len(beacons) == 442
+    return len(beacons)
 
-    # Second part
-    span = max(
-        s1.position.manhattan(s2.position)
-        for s1, s2 in combinations(list(aligned_scanners.values()), 2)
+
+def part2(scanners: list[Scanner]) -> int:
+
+    return max(
+        sum(abs(axis) for axis in unpack3(s1.position - s2.position))
+        for s1, s2 in combinations(scanners, 2)
     )
-    assert span == 11079
+
+
+ANSWERS = (442, 11079)
+
+
+def solve() -> None:
+
+    scanners = prepare(parse_input())
+
+    # First part
+    assert part1(scanners) == ANSWERS[0]
+
+    # Second part
+    assert part2(scanners) == ANSWERS[1]
 
 
 if __name__ == "__main__":
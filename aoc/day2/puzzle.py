@@ -1,43 +1,129 @@
+from __future__ import annotations
+import functools
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import accumulate, islice
+from operator import mul
 from pathlib import Path
+from typing import Iterable
+
+from aoc.parsing import Source, lines, span_lines, spans
+
+# Commands are encoded and reduced this many at a time within a span of a log
+BATCH = 1 << 16
+
+
+@dataclass(frozen=True)
+class Commands:
+    """Each command as how far it moves forward and how far it turns down
+
+    Every command only moves or only turns, so one of the two is always zero,
+    and turning up is turning down by a negative amount.
+    """
+
+    forward: array[int]
+    down: array[int]
 
 
 @dataclass(frozen=True)
-class Command:
-    direction: str
-    units: int
+class Course:
+    """Where a run of commands leads from any position
 
+    Starting with an aim of a, the run also adds a * forward to the depth, so
+    the courses of consecutive runs compose and can be reduced separately.
+    """
 
-def parse_input() -> list[Command]:
+    forward: int = 0
+    depth: int = 0
+    aim: int = 0
 
-    commands = []
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
-        direction, unit = line.split()
-        commands.append(Command(direction, int(unit)))
-    return commands
+    def then(self, other: Course) -> Course:
+        return Course(
+            self.forward + other.forward,
+            self.depth + other.depth + self.aim * other.forward,
+            self.aim + other.aim,
+        )
 
+    def product(self, use_aim: bool = False) -> int:
 
-def navigate(commands: list[Command], use_aim: bool = False) -> int:
+        # Without aim, turning down moves down instead, so the depth is the aim
+        return self.forward * (self.depth if use_aim else self.aim)
 
-    x = 0
-    y = 0
-    aim = 0
+
+def encode(commands: Iterable[bytes]) -> Commands:
+
+    forward = array("q")
+    down = array("q")
     for command in commands:
-        match command:
-            case Command("forward", units) if use_aim:
-                x += units
-                y += aim * units
-            case Command("forward", units):
-                x += units
-            case Command("up", units) if use_aim:
-                aim -= units
-            case Command("up", units):
-                y -= units
-            case Command("down", units) if use_aim:
-                aim += units
-            case Command("down", units):
-                y += units
-    return x * y
+        if not command:
+            continue
+        direction, units = command.split()
+        match direction:
+            case b"forward":
+                forward.append(int(units))
+                down.append(0)
+            case b"up":
+                forward.append(0)
+                down.append(-int(units))
+            case b"down":
+                forward.append(0)
+                down.append(int(units))
+    return Commands(forward, down)
+
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Commands:
+    return encode(lines(source))
+
+
+def course(commands: Commands) -> Course:
+
+    # The aim only changes on commands that do not move forward, so the aim
+    # after each command is also the aim every forward move goes at
+    aims = accumulate(commands.down)
+    return Course(
+        sum(commands.forward),
+        sum(map(mul, commands.forward, aims)),
+        sum(commands.down),
+    )
+
+
+def navigate(commands: Commands, use_aim: bool = False) -> int:
+    return course(commands).product(use_aim)
+
+
+def span_course(path: str | os.PathLike[str], span: tuple[int, int]) -> Course:
+
+    result = Course()
+    commands = span_lines(path, *span)
+    while batch := list(islice(commands, BATCH)):
+        result = result.then(course(encode(batch)))
+    return result
+
+
+def navigate_log(
+    path: str | os.PathLike[str], use_aim: bool = False, workers: int | None = None
+) -> int:
+    """Navigates a command log too large to hold, in spans across processes"""
+
+    workers = workers or os.cpu_count() or 1
+    # More spans than workers balance the load if some spans are slower
+    log = spans(path, 4 * workers)
+    with ProcessPoolExecutor(workers) as pool:
+        courses = pool.map(functools.partial(span_course, path), log)
+        return functools.reduce(Course.then, courses, Course()).product(use_aim)
+
+
+def part1(commands: Commands) -> int:
+    return navigate(commands)
+
+
+def part2(commands: Commands) -> int:
+    return navigate(commands, use_aim=True)
+
+
+ANSWERS = (1636725, 1872757425)
 
 
 def solve() -> None:
@@ -45,10 +131,10 @@ def solve() -> None:
     commands = parse_input()
 
     # First part
-    assert navigate(commands) == 1636725
+    assert part1(commands) == ANSWERS[0]
 
     # Second part
-    assert navigate(commands, use_aim=True) == 1872757425
+    assert part2(commands) == ANSWERS[1]
 
 
 if __name__ == "__main__":
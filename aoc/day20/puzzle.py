@@ -1,66 +1,96 @@
-from __future__ import annotations
 from pathlib import Path
-from typing import Iterable, Literal
-from dataclasses import dataclass
 
+from aoc.backends import cells, kernel, numpy
+from aoc.grid import BLOCK, Grid
+from aoc.parsing import Source, text
 
-@dataclass(frozen=True)
-class Pixel:
+PIXELS = bytes.maketrans(b".#", b"\x00\x01")
 
-    x: int
-    y: int
 
-    def neighbours(self) -> Iterable[Pixel]:
-        for y in range(-1, 2):
-            for x in range(-1, 2):
-                yield Pixel(self.x + x, self.y + y)
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> tuple[bytes, Grid]:
 
+    algorithm, image = text(source).split("\n\n")
 
-Pixels = dict[Pixel, Literal["#", "."]]
+    # Each enhancement reads pixels up to two steps outside of the image
+    pixels = Grid.parse(image, PIXELS, border=0, padding=2)
 
+    return algorithm.encode().translate(PIXELS), pixels
 
-def parse_input() -> tuple[dict[int, bool], Pixels]:
 
-    algorithm, image = (Path(__file__).parent / "input.txt").read_text().split("\n\n")
+def enhance(pixels: Grid, algorithm: bytes) -> Grid:
 
-    pixels: dict[Pixel, Literal["#", "."]] = {}
-    for y, row in enumerate(image.split("\n")):
-        for x, cell in enumerate(row):
-            assert cell == "#" or cell == "."
-            pixels[(Pixel(x, y))] = cell
+    # The border stands for the infinite background, which is either all
+    # dark or all lit, so it enhances into the first or the last rule
+    background = algorithm[0 if pixels.border == 0 else 511]
+    enhanced = Grid(pixels.width + 2, pixels.height + 2, border=background, padding=2)
 
-    return {i: v == "#" for i, v in enumerate(algorithm)}, pixels
+    cells = pixels.cells
+    enhanced_cells = enhanced.cells
+    offsets = pixels.offsets(BLOCK)
+    for y in range(enhanced.height):
+        source = pixels.index(-1, y - 1)
+        target = enhanced.index(0, y)
+        for x in range(enhanced.width):
+            bits = 0
+            for offset in offsets:
+                bits = bits << 1 | cells[source + x + offset]
+            enhanced_cells[target + x] = algorithm[bits]
+    return enhanced
 
 
-def solve() -> None:
+@kernel
+def lit_pixels(image: tuple[bytes, Grid], steps: int) -> int:
+
+    algorithm, pixels = image
+    for _ in range(steps):
+        pixels = enhance(pixels, algorithm)
+    return pixels.count(1)
+
+
+@lit_pixels.numpy
+def vectorised_lit_pixels(image: tuple[bytes, Grid], steps: int) -> int:
+
+    algorithm, pixels = image
+    rules = numpy.frombuffer(algorithm, dtype=numpy.uint8)
+    lit = cells(pixels)
+    background = pixels.border
+
+    for _ in range(steps):
+        # The image grows by one pixel on every side, whose 3x3 blocks reach
+        # another pixel into the background
+        padded = numpy.pad(lit, 2, constant_values=background)
+        height, width = padded.shape[0] - 2, padded.shape[1] - 2
+        bits = numpy.zeros((height, width), dtype=numpy.int16)
+        for x, y in BLOCK:
+            bits = bits << 1 | padded[1 + y : 1 + y + height, 1 + x : 1 + x + width]
+        lit = rules[bits]
+        background = algorithm[0 if background == 0 else 511]
+
+    return int(lit.sum())
 
-    algorithm, pixels = parse_input()
 
-    pixels_at_step: list[int] = []
+def part1(image: tuple[bytes, Grid]) -> int:
+    return lit_pixels(image, 2)
 
-    for step in range(1, 51):
 
-        next_gen: Pixels = {}
-        min_x, *_, max_x = sorted([p.x for p in pixels])
-        min_y, *_, max_y = sorted([p.y for p in pixels])
-        for y in range(min_y - 1, max_y + 2):
-            for x in range(min_x - 1, max_x + 2):
-                pixel = Pixel(x, y)
-                bits = 0
-                for neighbour in pixel.neighbours():
-                    if pixels.get(neighbour, "#" if step % 2 == 0 else ".") == "#":
-                        bits |= 1
-                    bits <<= 1
-                bits >>= 1
-                next_gen[pixel] = "#" if algorithm[bits] else "."
-        pixels = next_gen
-        pixels_at_step.append(len([pixel for pixel in pixels.values() if pixel == "#"]))
+def part2(image: tuple[bytes, Grid]) -> int:
+    return lit_pixels(image, 50)
+
+
+ANSWERS = (5437, 19340)
+
+
+def solve() -> None:
+
+    image = parse_input()
 
     # First part
-    assert pixels_at_step[1] == 5437
+    assert part1(image) == ANSWERS[0]
 
     # Second part
-    assert pixels_at_step[49] == 19340
+    assert part2(image) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
-import functools
 from typing import Iterator
 from pathlib import Path
 
+from aoc import instrument
+from aoc.parsing import Source, integers, read
 
-def parse_input() -> list[int]:
 
-    lines = (Path(__file__).parent / "input.txt").read_text().splitlines()
-    return [int(lines[0].split(": ")[1]), int(lines[1].split(": ")[1])]
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[int]:
+
+    # Each line holds the player number followed by its starting position
+    return integers(read(source))[1::2]
 
 
 def move(number: int) -> int:
@@ -53,7 +55,7 @@ def dirac_dice(positions: list[int]) -> tuple[int, int]:
         (9, 1),
     ]
 
-    @functools.cache
+    @instrument.cache
     def play(scores: tuple[int, int], positions: tuple[int, int]) -> tuple[int, int]:
 
         if any(score >= 21 for score in scores):
@@ -81,15 +83,26 @@ def dirac_dice(positions: list[int]) -> tuple[int, int]:
     return play((0, 0), (positions[0], positions[1]))
 
 
+def part1(positions: list[int]) -> int:
+    return deterministic_dice(positions)
+
+
+def part2(positions: list[int]) -> int:
+    return max(dirac_dice(positions))
+
+
+ANSWERS = (752745, 309196008717909)
+
+
 def solve() -> None:
 
     positions = parse_input()
 
     # First part
-    assert deterministic_dice(positions) == 752745
+    assert part1(positions) == ANSWERS[0]
 
     # Second part
-    assert max(dirac_dice(positions)) == 309196008717909
+    assert part2(positions) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from __future__ import annotations
-import re
 from dataclasses import dataclass
 from pathlib import Path
 
+from aoc import instrument
+from aoc.parsing import Source, chunks, integers, read
+
 
 @dataclass
 class Cuboid:
@@ -48,25 +50,24 @@ class Cuboid:
         return candidates
 
 
-def parse_input() -> list[Cuboid]:
-    cuboids: list[Cuboid] = []
-    pattern = r"(on|off) x=(-?\d+)..(-?\d+),y=(-?\d+)..(-?\d+),z=(-?\d+)..(-?\d+)"
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
-        on, x1, x2, y1, y2, z1, z2 = re.search(pattern, line).groups()
-        cuboids.append(
-            Cuboid(
-                (int(x1), int(x2)), (int(y1), int(y2)), (int(z1), int(z2)), on == "on"
-            )
-        )
-    return cuboids
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[Cuboid]:
+    data = read(source)
+    # Every line is a state followed by the bounds, without further whitespace
+    states = data.split()[::2]
+    return [
+        Cuboid((x1, x2), (y1, y2), (z1, z2), state == b"on")
+        for state, (x1, x2, y1, y2, z1, z2) in zip(states, chunks(integers(data), 6))
+    ]
 
 
 def split_cuboids(cuboids: list[Cuboid]) -> list[Cuboid]:
     previous = [cuboids[0]]
+    splits = largest = 0
     for cuboid in cuboids[1:]:
         next = []
         for existing_cuboid in previous:
             if existing_cuboid.intersects(cuboid):
+                splits += 1
                 for mini_cuboid in existing_cuboid.split(cuboid):
                     next.append(mini_cuboid)
             else:
@@ -74,21 +75,34 @@ def split_cuboids(cuboids: list[Cuboid]) -> list[Cuboid]:
         if cuboid.on:
             next.append(cuboid)
         previous = next
+        largest = max(largest, len(previous))
+
+    instrument.count("split_cuboids.splits", splits)
+    instrument.peak("split_cuboids.cuboids", largest)
     return previous
 
 
+def part1(cuboids: list[Cuboid]) -> int:
+    tiny = [cuboid for cuboid in cuboids if cuboid.tiny()]
+    return sum(cuboid.volume for cuboid in split_cuboids(tiny))
+
+
+def part2(cuboids: list[Cuboid]) -> int:
+    return sum(cuboid.volume for cuboid in split_cuboids(cuboids))
+
+
+ANSWERS = (615869, 1323862415207825)
+
+
 def solve() -> None:
 
     cuboids = parse_input()
 
     # First part
-    assert (
-        sum(cuboid.volume for cuboid in split_cuboids([c for c in cuboids if c.tiny()]))
-        == 615869
-    )
+    assert part1(cuboids) == ANSWERS[0]
 
     # Second part
-    assert sum(cuboid.volume for cuboid in split_cuboids(cuboids)) == 1323862415207825
+    assert part2(cuboids) == ANSWERS[1]
 
 
 if __name__ == "__main__":
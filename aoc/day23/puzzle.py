@@ -1,27 +1,20 @@
 from __future__ import annotations
-from collections import deque, defaultdict
-from heapq import heappush, heappop
+from collections import deque
 from dataclasses import dataclass
 from typing import Literal, Iterable, Deque
 from pathlib import Path
 
-
-@dataclass(frozen=True, order=True)
-class Point:
-
-    x: int
-    y: int
-
-    def neighbours(self) -> Iterable[Point]:
-        for x, y in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
-            yield Point(self.x + x, self.y + y)
+from aoc import instrument
+from aoc.coords import neighbours, pack, unpack, x_of, y_of
+from aoc.parsing import Source, text
+from aoc.search import SearchStats, astar
 
 
 @dataclass(frozen=True, order=True)
 class Pod:
 
     type: Literal["A", "B", "C", "D"]
-    pos: Point
+    pos: int
 
     def cost(self) -> int:
         if self.type == "A":
@@ -35,17 +28,17 @@ class Pod:
 
 
 rooms_small = {
-    "A": [Point(3, 2), Point(3, 3)],
-    "B": [Point(5, 2), Point(5, 3)],
-    "C": [Point(7, 2), Point(7, 3)],
-    "D": [Point(9, 2), Point(9, 3)],
+    "A": [pack(3, 2), pack(3, 3)],
+    "B": [pack(5, 2), pack(5, 3)],
+    "C": [pack(7, 2), pack(7, 3)],
+    "D": [pack(9, 2), pack(9, 3)],
 }
 
 rooms_large = {
-    "A": rooms_small["A"] + [Point(3, 4), Point(3, 5)],
-    "B": rooms_small["B"] + [Point(5, 4), Point(5, 5)],
-    "C": rooms_small["C"] + [Point(7, 4), Point(7, 5)],
-    "D": rooms_small["D"] + [Point(9, 4), Point(9, 5)],
+    "A": rooms_small["A"] + [pack(3, 4), pack(3, 5)],
+    "B": rooms_small["B"] + [pack(5, 4), pack(5, 5)],
+    "C": rooms_small["C"] + [pack(7, 4), pack(7, 5)],
+    "D": rooms_small["D"] + [pack(9, 4), pack(9, 5)],
 }
 
 room_points = set()
@@ -53,14 +46,17 @@ for points in rooms_large.values():
     for point in points:
         room_points.add(point)
 
+# The two rows that the second part inserts into the folded diagram
+FOLDED = ["  #D#C#B#A#", "  #D#B#A#C#"]
+
 hallway = [
-    Point(1, 1),
-    Point(2, 1),
-    Point(4, 1),
-    Point(6, 1),
-    Point(8, 1),
-    Point(10, 1),
-    Point(11, 1),
+    pack(1, 1),
+    pack(2, 1),
+    pack(4, 1),
+    pack(6, 1),
+    pack(8, 1),
+    pack(10, 1),
+    pack(11, 1),
 ]
 
 
@@ -68,7 +64,7 @@ hallway = [
 class State:
 
     pods: frozenset[Pod]
-    burrow: frozenset[Point]
+    burrow: frozenset[int]
 
     def is_valid(self) -> bool:
         for pod in self.pods:
@@ -77,17 +73,17 @@ class State:
         return True
 
     @property
-    def rooms(self) -> dict[str, list[Point]]:
+    def rooms(self) -> dict[str, list[int]]:
         return rooms_small if len(self.pods) == 8 else rooms_large
 
-    def possible_points(self, pod: Pod) -> dict[Point, int]:
+    def possible_points(self, pod: Pod) -> dict[int, int]:
         occupied = {other.pos for other in self.pods if other != pod}
-        queue: Deque[tuple[int, Point]] = deque([(0, pod.pos)])
+        queue: Deque[tuple[int, int]] = deque([(0, pod.pos)])
         visited = {pod.pos: 0}
 
         while queue:
             cost, pos = queue.popleft()
-            for neighbour in pos.neighbours():
+            for neighbour in neighbours(pos):
                 if (
                     neighbour in self.burrow
                     and neighbour not in occupied
@@ -97,7 +93,7 @@ class State:
                     visited[neighbour] = cost + pod.cost()
         return visited
 
-    def moves(self, pod: Pod) -> Iterable[tuple[int, Point]]:
+    def moves(self, pod: Pod) -> Iterable[tuple[int, int]]:
 
         # Pod is within the correct room
         if pod.pos in self.rooms[pod.type]:
@@ -137,17 +133,37 @@ class State:
                 if point in possible_points:
                     yield possible_points[point], point
 
+    def successors(self) -> Iterable[tuple[State, int]]:
+        for pod in self.pods:
+            for cost, point in self.moves(pod):
+                pods = frozenset(
+                    [Pod(pod.type, point)] + [p for p in self.pods if p != pod]
+                )
+                yield State(pods, self.burrow), cost
+
+    def estimate(self) -> int:
+        """Energy needed if pods could move through each other, a lower bound"""
+
+        energy = 0
+        for pod in self.pods:
+            room = self.rooms[pod.type]
+            if pod.pos in room:
+                continue
+            x, y = unpack(pod.pos)
+            # Up into the hallway, across to the room and one step into it
+            steps = y - 1 + abs(x - x_of(room[0])) + 1
+            energy += steps * pod.cost()
+        return energy
+
 
-def parse_input(input_file: str) -> State:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> State:
 
     pods: set[Pod] = set()
-    burrow: set[Point] = set()
+    burrow: set[int] = set()
 
-    for y, row in enumerate(
-        (Path(__file__).parent / input_file).read_text().splitlines()
-    ):
+    for y, row in enumerate(text(source).splitlines()):
         for x, cell in enumerate(row):
-            point = Point(x, y)
+            point = pack(x, y)
             if cell in "ABCD":
                 pods.add(Pod(cell, point))
                 burrow.add(point)
@@ -159,41 +175,54 @@ def parse_input(input_file: str) -> State:
 
 def least_energy(initial_state: State) -> int:
 
-    heap: list[tuple[int, State]] = []
-    heappush(heap, (0, initial_state))
-    costs = defaultdict(lambda: 1_000_000)
+    stats = SearchStats()
+    energy = astar(
+        initial_state, State.successors, State.is_valid, State.estimate, stats
+    )
+    instrument.count("least_energy.expanded", stats.expanded)
+    instrument.count("least_energy.stale", stats.stale)
+    instrument.peak("least_energy.peak_frontier", stats.peak_frontier)
+    return -1 if energy is None else energy
 
-    while heap:
 
-        cost, state = heappop(heap)
-        if state.is_valid():
-            return cost
+def unfold(state: State) -> State:
 
-        if costs[state.pods] <= cost:
-            continue
-        costs[state.pods] = cost
+    if len(state.pods) != 8:
+        raise ValueError("the diagram is already unfolded")
+
+    # The bottom row of pods moves down below the inserted rows
+    pods = {
+        Pod(pod.type, pod.pos + pack(0, len(FOLDED))) if y_of(pod.pos) == 3 else pod
+        for pod in state.pods
+    }
+    for y, row in enumerate(FOLDED, 3):
+        for x, cell in enumerate(row):
+            if cell in "ABCD":
+                pods.add(Pod(cell, pack(x, y)))  # type: ignore
+
+    return State(frozenset(pods), state.burrow | room_points)
 
-        for pod in state.pods:
-            for move_cost, point in state.moves(pod):
-                pods = frozenset(
-                    [Pod(pod.type, point)] + [p for p in state.pods if p != pod]
-                )
-                next_state = State(pods, state.burrow)
-                if costs[next_state.pods] > cost + move_cost:
-                    heappush(heap, (cost + move_cost, next_state))
 
-    return -1
+def part1(state: State) -> int:
+    return least_energy(state)
+
+
+def part2(state: State) -> int:
+    return least_energy(unfold(state))
+
+
+ANSWERS = (12240, 44618)
 
 
 def solve() -> None:
 
+    state = parse_input()
+
     # First part
-    state = parse_input("input_1.txt")
-    assert least_energy(state) == 12240
+    assert part1(state) == ANSWERS[0]
 
     # Second part
-    state = parse_input("input_2.txt")
-    assert least_energy(state) == 44618
+    assert part2(state) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,16 +1,21 @@
-from functools import cache, reduce
+from functools import reduce
 from operator import mul
 from pathlib import Path
 from typing import Iterable
 from collections import deque
 
+from aoc import instrument
+from aoc.parsing import Source, text
+
 
 Operation = list[str]
 
 
-def parse_input() -> list[Operation]:
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> list[Operation]:
     operations: list[Operation] = []
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
+    for line in text(source).splitlines():
         if line:
             operations.append((line.split()))
     return operations
@@ -58,57 +63,89 @@ def alu(ops: list[Operation], inputs: deque[int]) -> dict[str, int]:
     return variables
 
 
-def valid_model(digit_range: Iterable[int]) -> int:
+def constants(ops: list[Operation]) -> tuple[list[int], list[int], list[int]]:
+    """The x offset, z divisor and y offset of each block of the program
+
+    The program is made of identical 18 instruction blocks, one per digit,
+    which only differ in these three constants.
+    """
+
+    blocks = [ops[i : i + 18] for i in range(0, len(ops), 18)]
+    xs = [int(block[5][2]) for block in blocks]
+    zs = [int(block[4][2]) for block in blocks]
+    ws = [int(block[15][2]) for block in blocks]
+    return xs, zs, ws
+
 
-    # Hardcoded constants for this particular input
-    xs = [11, 11, 15, -14, 10, 0, -6, 13, -3, 13, 15, -2, -9, -2]
-    zs = [1, 1, 1, 26, 1, 26, 26, 1, 26, 1, 1, 26, 26, 26]
-    ws = [6, 14, 13, 1, 6, 13, 6, 3, 8, 14, 4, 7, 15, 1]
+def valid_model(ops: list[Operation], digit_range: Iterable[int]) -> int:
+
+    xs, zs, ws = constants(ops)
     max_z = [reduce(mul, zs[i:]) for i in range(len(zs))]
 
-    @cache
+    @instrument.cache
     def decompiled(number: int, offset: int, z: int):
-        """Decompiled version of the 14 input programs"""
+        """Decompiled version of the input program blocks"""
         if number == (z % 26 + xs[offset]):
             z = z // zs[offset]
         else:
             z = (z // zs[offset]) * 26 + number + ws[offset]
         return z
 
-    def search(digits: list[int], z: int) -> int:
-
-        if len(digits) == 14:
-            if z == 0:
-                return int("".join(str(d) for d in digits))
-            return 0
-
-        for digit in digit_range:
-            next_z = decompiled(digit, len(digits), z)
+    # A depth first search over the digits, with an iterator over the digits
+    # left to try at every position decided so far and the z after it
+    digits: list[int] = []
+    zs_after = [0]
+    stack = [iter(digit_range)]
+    while stack:
+        offset = len(digits)
+        for digit in stack[-1]:
+            next_z = decompiled(digit, offset, zs_after[-1])
             # If the next z value is larger than the product
             # of possible future divisions then z will never
-            # reach zero and the recursion can be terminated
+            # reach zero and the search can skip the digit
             # instantly
-            if next_z > max_z[len(digits)]:
+            if next_z > max_z[offset]:
+                continue
+            if offset + 1 == len(xs):
+                if next_z == 0:
+                    return int("".join(str(d) for d in digits + [digit]))
                 continue
-            if value := search(digits + [digit], next_z):
-                return value
-        return 0
+            digits.append(digit)
+            zs_after.append(next_z)
+            stack.append(iter(digit_range))
+            break
+        else:
+            stack.pop()
+            if digits:
+                digits.pop()
+                zs_after.pop()
+
+    return 0
+
+
+def part1(ops: list[Operation]) -> int:
+    # The largest model number is found first when trying the largest digits first
+    return valid_model(ops, list(range(9, 0, -1)))
+
+
+def part2(ops: list[Operation]) -> int:
+    return valid_model(ops, list(range(1, 10)))
+
 
-    return search([], 0)
+ANSWERS = (51983999947999, 11211791111365)
 
 
 def solve() -> None:
 
-    # The operations aren't really needed since the solution is
-    # based on manually decompiling the input and then doing a DFS
-    # using the decompiled program
+    # The search runs on a manually decompiled version of the program, of
+    # which only the constants are read from the input
     operations = parse_input()
 
     # First part
-    assert valid_model(list(range(1, 10))) == 11211791111365
+    assert part1(operations) == ANSWERS[0]
 
     # Second part
-    assert valid_model(list(range(9, 0, -1))) == 51983999947999
+    assert part2(operations) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,63 +1,97 @@
-from copy import deepcopy
 from pathlib import Path
 
+from aoc.backends import cells, kernel, numpy
+from aoc.grid import Grid
+from aoc.parsing import Source, text
 
-Grid = list[list[str]]
 
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Grid:
+    return Grid.parse(text(source), wrap=True)
 
-def parse_input() -> Grid:
-    return [
-        list(line)
-        for line in (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ]
+
+def move(herd: bytes, cucumber: bytes) -> bytes:
+    """Moves every cucumber facing an empty spot one step forward"""
+
+    # Replacing non-overlapping pairs from left to right moves each cucumber
+    # at most once, and only into spots that were empty before the move
+    moved = herd.replace(cucumber + b".", b"." + cucumber)
+    if herd[-1:] == cucumber and herd[:1] == b".":
+        moved = cucumber + moved[1:-1] + b"."
+    return moved
 
 
 def generate(grid: Grid) -> Grid:
 
-    after_east = deepcopy(grid)
+    grid = grid.copy()
 
-    for y in range(len(grid)):
-        for x in range(len(grid[y])):
-            cell = grid[y][x]
-            if cell != ">":
-                continue
-            nx = (x + 1) % len(grid[y])
-            next_pos = grid[y][nx]
-            if next_pos == ".":
-                after_east[y][nx] = ">"
-                after_east[y][x] = "."
+    for y in range(grid.height):
+        row = grid.row(y)
+        row[:] = move(row.tobytes(), b">")
 
-    after_south = deepcopy(after_east)
+    for x in range(grid.width):
+        column = grid.column(x)
+        column[:] = move(column.tobytes(), b"v")
 
-    for y in range(len(grid)):
-        for x in range(len(grid[y])):
-            cell = after_east[y][x]
-            if cell != "v":
-                continue
-            ny = (y + 1) % len(grid)
-            next_pos = after_east[ny][x]
-            if next_pos == ".":
-                after_south[ny][x] = "v"
-                after_south[y][x] = "."
+    return grid
 
-    return after_south
 
+@kernel
+def settle(grid: Grid) -> int:
+    """Number of the first step on which no sea cucumber moves"""
 
-def solve() -> None:
+    # The herd moves deterministically, so it has settled as soon as a step
+    # leaves it as it was. A herd can also cycle around the torus forever,
+    # which Brent's method spots by comparing each state to one saved at
+    # doubling distances, so only two earlier states need to be kept
+    saved, saved_step, power = grid.cells, 0, 1
+    step = 1
+    while (moved := generate(grid)).cells != grid.cells:
+        if moved.cells == saved:
+            raise ValueError("the herd never settles")
+        if step - saved_step == power:
+            saved, saved_step, power = moved.cells, step, power * 2
+        grid = moved
+        step += 1
+    return step
 
-    states: set[str] = set()
-    grid = parse_input()
-    step = 0
 
-    while True:
-        if (state := "\n".join("".join(row) for row in grid)) in states:
-            break
-        states.add(state)
-        grid = generate(grid)
+@settle.numpy
+def vectorised_settle(grid: Grid) -> int:
+
+    herd = cells(grid).copy()
+    empty = ord(".")
+    saved, saved_step, power = herd.copy(), 0, 1
+    step = 0
+    moved = True
+    while moved:
         step += 1
+        moved = False
+        for cucumber, axis in ((ord(">"), 1), (ord("v"), 0)):
+            moving = (herd == cucumber) & (numpy.roll(herd, -1, axis) == empty)
+            if moving.any():
+                moved = True
+                herd[moving] = empty
+                herd[numpy.roll(moving, 1, axis)] = cucumber
+        if moved and numpy.array_equal(herd, saved):
+            raise ValueError("the herd never settles")
+        if step - saved_step == power:
+            saved, saved_step, power = herd.copy(), step, power * 2
+    return step
+
+
+def part1(grid: Grid) -> int:
+    return settle(grid)
+
+
+ANSWERS = (400,)
+
+
+def solve() -> None:
+
+    grid = parse_input()
 
     # First part
-    assert step == 400
+    assert part1(grid) == ANSWERS[0]
 
 
 if __name__ == "__main__":
@@ -1,60 +1,134 @@
+from __future__ import annotations
 import operator
+from bisect import bisect_left
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+from aoc.backends import kernel, numpy
+from aoc.parsing import Source, lines
+
+
+@dataclass(frozen=True)
+class Report:
+    """The diagnostic report as its rows of binary digits laid end to end
+
+    Keeping the digits as bytes lets a column be sliced out of the rows with
+    a stride of the width, whatever the width is.
+    """
+
+    width: int
+    digits: bytes
+
+    def __len__(self) -> int:
+        return len(self.digits) // self.width
+
+    def values(self) -> list[int]:
+        return [
+            int(self.digits[start : start + self.width], 2)
+            for start in range(0, len(self.digits), self.width)
+        ]
+
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Report:
+
+    rows = [line for line in lines(source) if line]
+    return Report(len(rows[0]), b"".join(rows))
+
+
+@kernel
+def column_ones(report: Report) -> list[int]:
+    """Number of ones in each column, starting from the most significant"""
 
-def parse_input() -> list[int]:
     return [
-        int(line, 2)
-        for line in (Path(__file__).parent / "input.txt").read_text().splitlines()
+        report.digits[column :: report.width].count(b"1")
+        for column in range(report.width)
     ]
 
 
-def power_consumption(values: list[int]) -> int:
+@column_ones.numpy
+def vectorised_column_ones(report: Report) -> list[int]:
+
+    digits = numpy.frombuffer(report.digits, dtype=numpy.uint8)
+    ones = (digits.reshape(-1, report.width) == ord("1")).sum(axis=0)
+    return [int(count) for count in ones]
 
-    bits = max(values).bit_length()
 
-    ones = [0] * bits
-    for value in values:
-        for bit in range(bits):
-            ones[bit] += value >> bit & 1
+def power_consumption(report: Report) -> int:
 
     gamma = 0
-    for count in reversed(ones):
-        if count > len(values) / 2:
-            gamma |= 1
-        gamma <<= 1
-    gamma >>= 1
+    for count in column_ones(report):
+        gamma = gamma << 1 | (count > len(report) / 2)
 
-    epsilon = gamma ^ 0xFFF
+    epsilon = gamma ^ ((1 << report.width) - 1)
     return gamma * epsilon
 
 
-def life_support_rating(values: list[int]) -> int:
-    def find(values: list[int], compare: Callable[[int, int], bool]) -> int:
-        bits = max(values).bit_length() - 1
-        while len(values) > 1:
-            ones = [value for value in values if value >> bits & 1]
-            zeroes = [value for value in values if not value >> bits & 1]
-            values = ones if compare(len(ones), len(zeroes)) else zeroes
-            bits -= 1
-        return values.pop()
+@dataclass(frozen=True)
+class Index:
+    """The values of a report in ascending order
+
+    The values that start with the same bits form a contiguous range of the
+    sorted values, so every bit criterion narrows the range by bisection
+    instead of filtering the values into new lists.
+    """
 
-    oxygen = find(values, operator.ge)
-    scrubber = find(values, operator.lt)
+    width: int
+    values: list[int]
+
+    @classmethod
+    def build(cls, report: Report) -> Index:
+        return cls(report.width, sorted(report.values()))
+
+    def rating(self, keep_ones: Callable[[int, int], bool]) -> int:
+        """Finds the value left by keeping the ones or zeroes of every column"""
+
+        low, high = 0, len(self.values)
+        prefix = 0
+        for bit in reversed(range(self.width)):
+            if high - low == 1:
+                break
+            # The values in the range with this bit set all come after those
+            # without it
+            split = bisect_left(self.values, prefix | 1 << bit, low, high)
+            ones, zeroes = high - split, split - low
+            if ones and (not zeroes or keep_ones(ones, zeroes)):
+                low = split
+                prefix |= 1 << bit
+            else:
+                high = split
+        return self.values[low]
+
+
+def life_support_rating(report: Report) -> int:
+
+    index = Index.build(report)
+    oxygen = index.rating(operator.ge)
+    scrubber = index.rating(operator.lt)
 
     return scrubber * oxygen
 
 
+def part1(report: Report) -> int:
+    return power_consumption(report)
+
+
+def part2(report: Report) -> int:
+    return life_support_rating(report)
+
+
+ANSWERS = (4006064, 5941884)
+
+
 def solve() -> None:
 
-    values = parse_input()
+    report = parse_input()
 
     # First part
-    assert power_consumption(values) == 4006064
+    assert part1(report) == ANSWERS[0]
 
     # Second part
-    assert life_support_rating(values) == 5941884
+    assert part2(report) == ANSWERS[1]
 
 
 if __name__ == "__main__":
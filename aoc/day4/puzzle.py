@@ -1,69 +1,131 @@
+from dataclasses import dataclass
+from itertools import chain, groupby
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+from typing import Iterable, Iterator
 
+from aoc.parsing import Source, integers, lines
 
-def parse_input() -> tuple[list[int], list[list[list[int]]]]:
 
-    lines = (Path(__file__).parent / "input.txt").read_text().splitlines()
-    numbers = [int(number) for number in lines[0].split(",")]
+@dataclass(frozen=True)
+class Game:
 
-    boards = []
-    for line in lines[1:]:
-        if not line:
-            boards.append([])
-            continue
-        boards[-1].append([int(value) for value in line.split()])
-    return numbers, boards
+    draws: list[int]
+    width: int
+    # The cells of each board row by row, flattened into a tuple of ints so
+    # that millions of boards do not keep the garbage collector busy
+    boards: Iterable[tuple[int, ...]]
 
 
-def bingo(numbers: list[int], boards: list[list[list[int]]]) -> list[int]:
+class Boards:
+    """Boards parsed as they are iterated over, which can only happen once"""
 
-    columns_and_rows_for_value = defaultdict(list)
+    def __init__(self, boards: Iterator[tuple[int, ...]]) -> None:
+        self.boards = boards
+        self.consumed = False
 
-    for board, rows in enumerate(boards):
-        values_for_column = defaultdict(set)
-        values_for_row = defaultdict(set)
-        for y, row in enumerate(rows):
-            for x, value in enumerate(row):
-                values_for_column[y].add(value)
-                values_for_row[x].add(value)
-                columns_and_rows_for_value[value] += [
-                    (board, values_for_column[y]),
-                    (board, values_for_row[x]),
-                ]
+    def __iter__(self) -> Iterator[tuple[int, ...]]:
+        # A second pass would silently find no boards at all
+        if self.consumed:
+            raise RuntimeError("the streamed boards have already been iterated over")
+        self.consumed = True
+        return self.boards
 
-    winners = set()
-    scores = []
 
-    for current, number in enumerate(numbers):
-        for board, row_or_column in columns_and_rows_for_value[number]:
-            if board in winners:
-                continue
+def stream(source: Source = Path(__file__).parent / "input.txt") -> Game:
+    """The game with its boards parsed lazily as they are iterated over
 
-            row_or_column.remove(number)
-            if not row_or_column:
-                winners.add(board)
-                score = sum(
-                    value
-                    for row in boards[board]
-                    for value in row
-                    if value not in numbers[: current + 1]
-                )
-                scores.append(number * score)
+    The boards are never held at once, so the game can only be played once.
+    """
 
-    return scores
+    blocks = (list(block) for filled, block in groupby(lines(source), bool) if filled)
+    (draws,) = next(blocks)
+
+    # All boards have the width of the first one
+    first = next(blocks, [])
+    width = len(integers(first[0])) if first else 0
+    boards = (
+        tuple(integers(b" ".join(block))) for block in chain([first], blocks) if block
+    )
+    return Game(integers(draws), width, Boards(boards))
+
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Game:
+
+    game = stream(source)
+    return Game(game.draws, game.width, list(game.boards))
+
+
+def wins(game: Game) -> Iterator[tuple[int, int]]:
+    """The turn on which each board wins and its score, in the order of boards
+
+    A line is complete on the turn its last number is drawn, and a board wins
+    with its first complete line, so no draws need to be replayed.
+    """
+
+    turns: dict[int, int] = {}
+    for turn, number in enumerate(game.draws):
+        turns.setdefault(number, turn)
+    never = len(game.draws)
+    width = game.width
+
+    for board in game.boards:
+        drawn = [turns.get(value, never) for value in board]
+        rows = (drawn[start : start + width] for start in range(0, len(drawn), width))
+        columns = (drawn[column::width] for column in range(width))
+        turn = min(map(max, chain(rows, columns)))
+        if turn < never:
+            unmarked = sum(value for value, on in zip(board, drawn) if on > turn)
+            yield turn, game.draws[turn] * unmarked
+
+
+def bingo(game: Game) -> list[int]:
+    """Scores of the boards in the order they win"""
+
+    return [score for _, score in sorted(wins(game), key=itemgetter(0))]
+
+
+def first_and_last(game: Game) -> tuple[int, int]:
+    """Scores of the first and last boards to win, in one pass over the boards"""
+
+    first = last = None
+    for win in wins(game):
+        # Boards that win on the same turn win in the order of the boards
+        if first is None or win[0] < first[0]:
+            first = win
+        if last is None or win[0] >= last[0]:
+            last = win
+    if first is None or last is None:
+        raise ValueError("no board wins")
+    return first[1], last[1]
+
+
+def prepare(game: Game) -> tuple[int, int]:
+    """Finds the first and last winners once, since both parts need a pass"""
+
+    return first_and_last(game)
+
+
+def part1(scores: tuple[int, int]) -> int:
+    return scores[0]
+
+
+def part2(scores: tuple[int, int]) -> int:
+    return scores[1]
+
+
+ANSWERS = (51776, 16830)
 
 
 def solve() -> None:
 
-    numbers, boards = parse_input()
-    scores = bingo(numbers, boards)
+    scores = prepare(parse_input())
 
     # First part
-    assert scores[0] == 51776
+    assert part1(scores) == ANSWERS[0]
 
     # Second part
-    assert scores[-1] == 16830
+    assert part2(scores) == ANSWERS[1]
 
 
 if __name__ == "__main__":
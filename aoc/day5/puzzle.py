@@ -1,56 +1,45 @@
-import re
 from dataclasses import dataclass
 from typing import Iterator
 from pathlib import Path
 
-
-@dataclass(frozen=True)
-class Vector:
-
-    x: int
-    y: int
+from aoc.coords import pack, unpack
+from aoc.parsing import Source, chunks, integers, read
 
 
 @dataclass(frozen=True)
 class Line:
 
-    start: Vector
-    end: Vector
+    start: int
+    end: int
 
     def is_diagonal(self) -> bool:
-        return self.start.x != self.end.x and self.start.y != self.end.y
+        (x1, y1), (x2, y2) = unpack(self.start), unpack(self.end)
+        return x1 != x2 and y1 != y2
 
-    def __iter__(self) -> Iterator[Vector]:
+    def __iter__(self) -> Iterator[int]:
         """Yields all points on the line"""
 
-        xd = self.end.x - self.start.x
-        yd = self.end.y - self.start.y
-        unit = Vector(xd // abs(xd) if xd != 0 else 0, yd // abs(yd) if yd != 0 else 0)
+        (x1, y1), (x2, y2) = unpack(self.start), unpack(self.end)
+        xd = x2 - x1
+        yd = y2 - y1
+        unit = pack(xd // abs(xd) if xd != 0 else 0, yd // abs(yd) if yd != 0 else 0)
 
-        current = self.start
-        while current != Vector(self.end.x + unit.x, self.end.y + unit.y):
-            yield current
-            current = Vector(current.x + unit.x, current.y + unit.y)
+        # Packed points on a line are evenly spaced integers
+        return iter(range(self.start, self.end + unit, unit) if unit else ())
 
 
-def parse_input() -> list[Line]:
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[Line]:
 
-    lines: list[Line] = []
-    pattern = r"(\d+),(\d+) -> (\d+),(\d+)"
+    return [
+        Line(pack(x1, y1), pack(x2, y2))
+        for x1, y1, x2, y2 in chunks(integers(read(source), signed=False), 4)
+    ]
 
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
-        groups = re.match(pattern, line).groups()
-        start = Vector(int(groups[0]), int(groups[1]))
-        end = Vector(int(groups[2]), int(groups[3]))
-        lines.append(Line(start, end))
 
-    return lines
+def intersections(lines: list[Line]) -> set[int]:
 
-
-def intersections(lines: list[Line]) -> set[Vector]:
-
-    points: set[Vector] = set()
-    intersections: set[Vector] = set()
+    points: set[int] = set()
+    intersections: set[int] = set()
 
     for line in lines:
         for point in line:
@@ -62,17 +51,26 @@ def intersections(lines: list[Line]) -> set[Vector]:
     return intersections
 
 
+def part1(lines: list[Line]) -> int:
+    return len(intersections([line for line in lines if not line.is_diagonal()]))
+
+
+def part2(lines: list[Line]) -> int:
+    return len(intersections(lines))
+
+
+ANSWERS = (4826, 16793)
+
+
 def solve() -> None:
 
     lines = parse_input()
 
     # First part
-    assert (
-        len(intersections([line for line in lines if not line.is_diagonal()])) == 4826
-    )
+    assert part1(lines) == ANSWERS[0]
 
     # Second part
-    assert len(intersections(lines)) == 16793
+    assert part2(lines) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -1,12 +1,11 @@
 from collections import defaultdict
 from pathlib import Path
 
+from aoc.parsing import Source, integers, read
 
-def parse_input() -> list[int]:
-    return [
-        int(value)
-        for value in (Path(__file__).parent / "input.txt").read_text().split(",")
-    ]
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[int]:
+    return integers(read(source))
 
 
 def simulate(fish: list[int]) -> list[int]:
@@ -29,16 +28,26 @@ def simulate(fish: list[int]) -> list[int]:
     return days
 
 
+def part1(fish: list[int]) -> int:
+    return simulate(fish)[79]
+
+
+def part2(fish: list[int]) -> int:
+    return simulate(fish)[255]
+
+
+ANSWERS = (379114, 1702631502303)
+
+
 def solve() -> None:
 
     fish = parse_input()
-    days = simulate(fish)
 
     # First part
-    assert days[79] == 379114
+    assert part1(fish) == ANSWERS[0]
 
     # Second part
-    assert days[255] == 1702631502303
+    assert part2(fish) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -3,12 +3,11 @@ from typing import Callable
 from collections import Counter
 from pathlib import Path
 
+from aoc.parsing import Source, integers, read
 
-def parse_input() -> list[int]:
-    return [
-        int(value)
-        for value in (Path(__file__).parent / "input.txt").read_text().split(",")
-    ]
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> list[int]:
+    return integers(read(source))
 
 
 def minimum_cost(crabs: dict[int, int], cost: Callable[[int], int]) -> int:
@@ -24,23 +23,32 @@ def minimum_cost(crabs: dict[int, int], cost: Callable[[int], int]) -> int:
     return cheapest
 
 
-def solve() -> None:
-
-    positions = parse_input()
-
-    crabs = Counter(positions)
-
-    # First part
+def part1(positions: list[int]) -> int:
     def constant_cost(n: int) -> int:
         return n
 
-    assert minimum_cost(crabs, constant_cost) == 344138
+    return minimum_cost(Counter(positions), constant_cost)
 
-    # Second part
+
+def part2(positions: list[int]) -> int:
     def nonconstant_cost(n: int) -> int:
         return (n ** 2 + n) // 2
 
-    assert minimum_cost(crabs, nonconstant_cost) == 94862124
+    return minimum_cost(Counter(positions), nonconstant_cost)
+
+
+ANSWERS = (344138, 94862124)
+
+
+def solve() -> None:
+
+    positions = parse_input()
+
+    # First part
+    assert part1(positions) == ANSWERS[0]
+
+    # Second part
+    assert part2(positions) == ANSWERS[1]
 
 
 if __name__ == "__main__":
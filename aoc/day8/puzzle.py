@@ -1,6 +1,8 @@
 from typing import Iterable
 from pathlib import Path
 
+from aoc.parsing import Source, text
+
 VALID_DIGITS = {
     "abcefg": "0",
     "cf": "1",
@@ -15,9 +17,11 @@ VALID_DIGITS = {
 }
 
 
-def parse_input() -> list[tuple[str, str]]:
+def parse_input(
+    source: Source = Path(__file__).parent / "input.txt",
+) -> list[tuple[str, str]]:
     entries = []
-    for line in (Path(__file__).parent / "input.txt").read_text().splitlines():
+    for line in text(source).splitlines():
         signals, digits = line.split(" | ")
         entries.append((signals.split(), digits.split()))
     return entries
@@ -63,28 +67,39 @@ def find_correct_wiring(
     return {}
 
 
-def solve() -> None:
+def part1(entries: list[tuple[str, str]]) -> int:
 
-    entries = parse_input()
-
-    # First part
     count = 0
     for signals, digits in entries:
         for digit in digits:
             if len(digit) in (2, 4, 3, 7):
                 count += 1
+    return count
 
-    assert count == 532
 
-    # Second part
+def part2(entries: list[tuple[str, str]]) -> int:
+
     output_sum = 0
     for signals, digits in entries:
         signals = sorted([set(s) for s in signals], key=lambda s: len(s), reverse=True)
         wiring_map = find_correct_wiring(signals, set("abcdefg"), {})
         display = [VALID_DIGITS[signal_to_digit(digit, wiring_map)] for digit in digits]
         output_sum += int("".join(display))
+    return output_sum
+
+
+ANSWERS = (532, 1011284)
 
-    assert output_sum == 1011284
+
+def solve() -> None:
+
+    entries = parse_input()
+
+    # First part
+    assert part1(entries) == ANSWERS[0]
+
+    # Second part
+    assert part2(entries) == ANSWERS[1]
 
 
 if __name__ == "__main__":
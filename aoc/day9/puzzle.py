@@ -2,51 +2,54 @@ import operator
 from collections import deque
 from functools import reduce
 from pathlib import Path
-from typing import Iterable
 
-Point = tuple[int, int]
-Grid = list[list[int]]
+from aoc.grid import DIGITS, ORTHOGONAL, Grid
+from aoc.parsing import Source, text
 
 
-def parse_input() -> Grid:
-    return [
-        list(int(col) for col in row)
-        for row in (Path(__file__).parent / "input.txt").read_text().splitlines()
-    ]
-
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> Grid:
+    # The border is as high as the highest point, so it never belongs to a
+    # basin and never prevents a point from being a low point
+    return Grid.parse(text(source), DIGITS, border=9)
 
-def adjacents(point: Point, grid: Grid) -> Iterable[Point]:
-    for xd, yd in [(-1, 0), (0, -1), (1, 0), (0, 1)]:
-        nx = point[0] + xd
-        ny = point[1] + yd
-        if not 0 <= nx < len(grid[point[1]]):
-            continue
-        if not 0 <= ny < len(grid):
-            continue
-        yield (nx, ny)
 
+def basin_size(point: int, grid: Grid) -> int:
 
-def basin_size(point: Point, grid: Grid) -> int:
-
+    cells = grid.cells
+    offsets = grid.offsets(ORTHOGONAL)
     points = deque([point])
     seen = set()
     while points:
-        for x, y in adjacents(points.popleft(), grid):
-            if grid[y][x] != 9 and (x, y) not in seen:
-                points.append((x, y))
-                seen.add((x, y))
+        current = points.popleft()
+        for offset in offsets:
+            adjacent = current + offset
+            if cells[adjacent] != 9 and adjacent not in seen:
+                points.append(adjacent)
+                seen.add(adjacent)
     return len(seen)
 
 
-def find_low_points(grid: Grid) -> list[Point]:
+def find_low_points(grid: Grid) -> list[int]:
+
+    cells = grid.cells
+    offsets = grid.offsets(ORTHOGONAL)
+    return [
+        point
+        for point in grid.indices()
+        if all(cells[point] < cells[point + offset] for offset in offsets)
+    ]
+
+
+def part1(grid: Grid) -> int:
+    return sum(grid.cells[point] + 1 for point in find_low_points(grid))
+
+
+def part2(grid: Grid) -> int:
+    basins = sorted(basin_size(point, grid) for point in find_low_points(grid))
+    return reduce(operator.mul, basins[-3:])
+
 
-    low_points = []
-    for y in range(len((grid))):
-        for x in range(len(grid[y])):
-            adjacent_heights = [grid[ay][ax] for ax, ay in adjacents((x, y), grid)]
-            if all(grid[y][x] < adj for adj in adjacent_heights):
-                low_points.append((x, y))
-    return low_points
+ANSWERS = (496, 902880)
 
 
 def solve() -> None:
@@ -54,12 +57,10 @@ def solve() -> None:
     grid = parse_input()
 
     # First part
-    low_points = find_low_points(grid)
-    assert sum(grid[y][x] + 1 for x, y in low_points) == 496
+    assert part1(grid) == ANSWERS[0]
 
     # Second part
-    top_basins = sorted(basin_size(point, grid) for point in low_points)[-3:]
-    assert reduce(operator.mul, top_basins) == 902880
+    assert part2(grid) == ANSWERS[1]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,593 @@
+"""Seeded generators for synthetic puzzle inputs of arbitrary size
+
+Each generator returns the text of an input file in the same format as the
+day's input.txt, so the output can be fed to the day's parse_input().
+"""
+import argparse
+import random
+import string
+import sys
+from itertools import islice, product
+from pathlib import Path
+from typing import Callable
+
+Generator = Callable[[int, random.Random], str]
+
+
+def day1(size: int, rng: random.Random) -> str:
+
+    depth = rng.randint(100, 200)
+    depths = []
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 15))
+        depths.append(depth)
+    return "\n".join(map(str, depths))
+
+
+def day2(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        f"{rng.choice(['forward', 'forward', 'up', 'down'])} {rng.randint(1, 9)}"
+        for _ in range(size)
+    )
+
+
+def day3(size: int, rng: random.Random) -> str:
+
+    # The values have to be unique for the life support rating to terminate
+    width = max(12, (size - 1).bit_length())
+    values = rng.sample(range(2 ** width), size)
+    return "\n".join(f"{value:0{width}b}" for value in values)
+
+
+def day4(size: int, rng: random.Random) -> str:
+
+    numbers = list(range(max(100, size)))
+    rng.shuffle(numbers)
+
+    boards = []
+    for _ in range(size):
+        cells = rng.sample(numbers, 25)
+        boards.append(
+            "\n".join(
+                " ".join(f"{cell:>2}" for cell in cells[row * 5 : row * 5 + 5])
+                for row in range(5)
+            )
+        )
+    return ",".join(map(str, numbers)) + "\n\n" + "\n\n".join(boards)
+
+
+def day5(size: int, rng: random.Random) -> str:
+
+    lines = []
+    for _ in range(size):
+        x1, y1 = rng.randrange(1000), rng.randrange(1000)
+        length = rng.randint(1, 500)
+        match rng.randrange(3):
+            case 0:
+                x2, y2 = x1, min(999, y1 + length)
+            case 1:
+                x2, y2 = min(999, x1 + length), y1
+            case _:
+                length = min(length, 999 - x1, 999 - y1)
+                x2, y2 = x1 + length, y1 + length
+        if rng.random() < 0.5:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        lines.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(lines)
+
+
+def day6(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(size))
+
+
+def day7(size: int, rng: random.Random) -> str:
+    return ",".join(str(rng.randrange(2 * size + 1)) for _ in range(size))
+
+
+def day8(size: int, rng: random.Random) -> str:
+
+    digits = [
+        "abcefg",
+        "cf",
+        "acdeg",
+        "acdfg",
+        "bcdf",
+        "abdfg",
+        "abdefg",
+        "acf",
+        "abcdefg",
+        "abcdfg",
+    ]
+
+    def scramble(wiring: dict[str, str], digit: str) -> str:
+        wires = [wiring[segment] for segment in digit]
+        rng.shuffle(wires)
+        return "".join(wires)
+
+    entries = []
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+        signals = [scramble(wiring, digit) for digit in rng.sample(digits, 10)]
+        output = [scramble(wiring, rng.choice(digits)) for _ in range(4)]
+        entries.append(f"{' '.join(signals)} | {' '.join(output)}")
+    return "\n".join(entries)
+
+
+def digit_grid(size: int, rng: random.Random, digits: str) -> str:
+    return "\n".join(
+        "".join(rng.choice(digits) for _ in range(size)) for _ in range(size)
+    )
+
+
+def day9(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, "0123456789999")
+
+
+def day10(size: int, rng: random.Random) -> str:
+
+    pairs = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+    lines = []
+    for _ in range(size):
+        line: list[str] = []
+        stack: list[str] = []
+        length = rng.randint(50, 110)
+        corrupted = rng.random() < 0.5
+        while len(line) < length:
+            if stack and rng.random() < 0.45:
+                line.append(pairs[stack.pop()])
+            else:
+                stack.append(rng.choice("([{<"))
+                line.append(stack[-1])
+        if corrupted and stack:
+            expected = pairs[stack[-1]]
+            line.append(rng.choice([c for c in ")]}>" if c != expected]))
+        elif not stack:
+            line.append(rng.choice("([{<"))
+        lines.append("".join(line))
+    return "\n".join(lines)
+
+
+def day11(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, "0123456789")
+
+
+def cave_names(count: int, letters: str) -> list[str]:
+
+    # The entrance and the exit are named by the generators themselves, so
+    # they are left out and there have to be enough names without them
+    reserved = ("start", "end")
+    length = 2
+    while len(letters) ** length < count + len(reserved):
+        length += 1
+    names = ("".join(name) for name in product(letters, repeat=length))
+    names = (name for name in names if name not in reserved)
+    return list(islice(names, count))
+
+
+def day12(size: int, rng: random.Random) -> str:
+
+    small = cave_names(max(1, size), string.ascii_lowercase)
+    big = cave_names(max(1, size // 4), string.ascii_uppercase)
+
+    # Big caves are never connected to each other, otherwise there would be
+    # infinitely many paths. The number of paths still grows exponentially
+    # with the number of caves, so keep the size small.
+    edges: set[frozenset[str]] = set()
+    for cave in small + ["start", "end"]:
+        for neighbour in rng.sample(small + big, min(2, len(small) + len(big))):
+            if cave != neighbour:
+                edges.add(frozenset((cave, neighbour)))
+    return "\n".join("-".join(rng.sample(sorted(edge), 2)) for edge in edges)
+
+
+def day13(size: int, rng: random.Random) -> str:
+
+    folds: list[tuple[str, int]] = []
+    width, height = 40, 6
+    for _ in range(6):
+        folds += [("x", width), ("y", height)]
+        width, height = 2 * width + 1, 2 * height + 1
+
+    # Points are placed on the folded paper and unfolded one fold at a time,
+    # so that no point ever ends up on a fold line
+    points = []
+    for _ in range(size):
+        x, y = rng.randrange(40), rng.randrange(6)
+        for axis, line in folds:
+            if rng.random() < 0.5:
+                if axis == "x":
+                    x = 2 * line - x
+                else:
+                    y = 2 * line - y
+        points.append(f"{x},{y}")
+
+    instructions = [f"fold along {axis}={line}" for axis, line in reversed(folds)]
+    return "\n".join(points) + "\n\n" + "\n".join(instructions)
+
+
+def day14(size: int, rng: random.Random) -> str:
+
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choice(elements) for _ in range(max(2, size)))
+    rules = [
+        f"{a}{b} -> {rng.choice(elements)}" for a, b in product(elements, repeat=2)
+    ]
+    return template + "\n\n" + "\n".join(rules)
+
+
+def day15(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, "123456789")
+
+
+def day16(size: int, rng: random.Random) -> str:
+    def literal(value: int) -> str:
+        groups = [value >> shift & 0xF for shift in range(0, value.bit_length(), 4)]
+        groups = groups[::-1] or [0]
+        return "".join(
+            f"{int(i < len(groups) - 1)}{group:04b}" for i, group in enumerate(groups)
+        )
+
+    def packet(budget: int, depth: int) -> str:
+
+        header = f"{rng.randrange(8):03b}"
+        if budget <= 1 or depth >= 12:
+            return header + "100" + literal(rng.randrange(16))
+
+        # Products are kept small so that the values do not explode
+        type = rng.choice([0, 0, 2, 3, 5, 6, 7] + ([1] if budget < 10 else []))
+        if type in (5, 6, 7) or budget < 3:
+            children = 2
+        else:
+            children = min(budget - 1, 2047, max(rng.randint(1, 5), budget // 64))
+        cuts = sorted(rng.sample(range(1, max(budget - 1, children)), children - 1))
+        shares = [end - start for start, end in zip([0] + cuts, cuts + [budget - 1])]
+
+        payload = "".join(packet(share, depth + 1) for share in shares)
+        if len(payload) < 2 ** 15 and rng.random() < 0.5:
+            return header + f"{type:03b}" + "0" + f"{len(payload):015b}" + payload
+        return header + f"{type:03b}" + "1" + f"{children:011b}" + payload
+
+    bits = packet(max(1, size), 0)
+    bits += "0" * (-len(bits) % 4)
+    return f"{int(bits, 2):0{len(bits) // 4}X}"
+
+
+def day17(size: int, rng: random.Random) -> str:
+
+    size = max(10, size)
+    x1 = rng.randint(size, 2 * size)
+    x2 = x1 + rng.randint(size // 10, size // 5)
+    y1 = -rng.randint(size // 2, size)
+    y2 = y1 + rng.randint(size // 10, size // 4)
+    return f"target area: x={x1}..{x2}, y={y1}..{y2}"
+
+
+def day18(size: int, rng: random.Random) -> str:
+    def number(depth: int) -> str:
+        if depth == 4 or (depth > 0 and rng.random() < 0.3):
+            return str(rng.randrange(10))
+        return f"[{number(depth + 1)},{number(depth + 1)}]"
+
+    return "\n".join(number(0) for _ in range(size))
+
+
+Vector = tuple[int, int, int]
+Matrix = tuple[Vector, Vector, Vector]
+
+
+def transform(matrix: Matrix, vector: Vector) -> Vector:
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    x, y, z = vector
+    return (a * x + b * y + c * z, d * x + e * y + f * z, g * x + h * y + i * z)
+
+
+def transpose(matrix: Matrix) -> Matrix:
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    return ((a, d, g), (b, e, h), (c, f, i))
+
+
+def multiply(a: Matrix, b: Matrix) -> Matrix:
+    columns = transpose(b)
+    return (
+        transform(columns, a[0]),
+        transform(columns, a[1]),
+        transform(columns, a[2]),
+    )
+
+
+def day19(size: int, rng: random.Random) -> str:
+
+    # Every orientation the solver tries is a product of these matrices
+    directions: list[Matrix] = [
+        ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+        ((0, 1, 0), (-1, 0, 0), (0, 0, 1)),
+        ((-1, 0, 0), (0, -1, 0), (0, 0, 1)),
+        ((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+        ((1, 0, 0), (0, 0, -1), (0, 1, 0)),
+        ((1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    ]
+    rotations: list[Matrix] = [
+        ((1, 0, 0), (0, 1, 0), (0, 0, 1)),
+        ((0, 0, -1), (0, 1, 0), (1, 0, 0)),
+        ((-1, 0, 0), (0, 1, 0), (0, 0, -1)),
+        ((0, 0, 1), (0, 1, 0), (-1, 0, 0)),
+    ]
+
+    used: set[Vector] = set()
+
+    def near(center: Vector, spread: int) -> Vector:
+        while True:
+            x, y, z = (c + rng.randint(-spread, spread) for c in center)
+            if (x, y, z) not in used:
+                used.add((x, y, z))
+                return (x, y, z)
+
+    # Every scanner shares twelve beacons with a random earlier scanner
+    positions: list[Vector] = [(0, 0, 0)]
+    beacons: list[set[Vector]] = [set()]
+    for scanner in range(1, max(1, size)):
+        parent = rng.randrange(scanner)
+        positions.append(near(positions[parent], 1200))
+        x, y, z = ((a + b) // 2 for a, b in zip(positions[parent], positions[-1]))
+        shared = {near((x, y, z), 400) for _ in range(12)}
+        beacons[parent] |= shared
+        beacons.append(set(shared))
+    for scanner, position in enumerate(positions):
+        beacons[scanner] |= {near(position, 900) for _ in range(rng.randint(2, 6))}
+
+    reports = []
+    for scanner, (px, py, pz) in enumerate(positions):
+        orientation = multiply(rng.choice(rotations), rng.choice(directions))
+        # Rotations are orthogonal, so the transpose undoes the orientation
+        inverse = transpose(orientation) if scanner else directions[0]
+        relative = [
+            transform(inverse, (x - px, y - py, z - pz)) for x, y, z in beacons[scanner]
+        ]
+        rng.shuffle(relative)
+        reports.append(
+            f"--- scanner {scanner} ---\n"
+            + "\n".join(",".join(map(str, beacon)) for beacon in relative)
+        )
+    return "\n\n".join(reports)
+
+
+def day20(size: int, rng: random.Random) -> str:
+
+    # The solver tracks the infinite background, which may stay dark or blink,
+    # but the count of lit pixels is only finite if it never stays lit
+    first = rng.choice("#.")
+    last = "." if first == "#" else rng.choice("#.")
+    algorithm = [first] + [rng.choice("#.") for _ in range(510)] + [last]
+    return "".join(algorithm) + "\n\n" + digit_grid(size, rng, "#.")
+
+
+def day21(size: int, rng: random.Random) -> str:
+    return (
+        f"Player 1 starting position: {rng.randint(1, 10)}\n"
+        f"Player 2 starting position: {rng.randint(1, 10)}"
+    )
+
+
+def day22(size: int, rng: random.Random) -> str:
+    def step(on: bool, low: int, high: int, extent: int) -> str:
+        ranges = []
+        for axis in "xyz":
+            start = rng.randint(low, high - extent)
+            ranges.append(f"{axis}={start}..{start + rng.randint(1, extent)}")
+        return f"{'on' if on else 'off'} {','.join(ranges)}"
+
+    size = max(1, size)
+    tiny = max(1, size // 20)
+    steps = [step(i == 0 or rng.random() < 0.7, -50, 50, 50) for i in range(tiny)] + [
+        step(rng.random() < 0.6, -100_000, 100_000, 40_000) for _ in range(size - tiny)
+    ]
+    return "\n".join(steps)
+
+
+def day23(size: int, rng: random.Random) -> str:
+
+    # The burrow always has the folded shape of the first part, which the
+    # second part unfolds, so only the arrangement of the pods is random
+    pods = list("ABCD" * 2)
+    rng.shuffle(pods)
+
+    rows = ["#############", "#...........#"]
+    for row in range(2):
+        cells = "#".join(pods[row * 4 : row * 4 + 4])
+        rows.append(f"###{cells}###" if row == 0 else f"  #{cells}#")
+    rows.append("  #########")
+    return "\n".join(rows)
+
+
+def day24(size: int, rng: random.Random) -> str:
+
+    # Every block either pushes a digit onto z, which acts as a base 26
+    # stack, or pops one back off, so the blocks come in matching pairs
+    blocks = max(2, size + size % 2)
+    pushes = blocks // 2
+    kinds: list[bool] = []
+    depth = 0
+    while len(kinds) < blocks:
+        if depth == 0 or (pushes and rng.random() < 0.5):
+            kinds.append(True)
+            pushes -= 1
+            depth += 1
+        else:
+            kinds.append(False)
+            depth -= 1
+
+    # A pop only keeps z from growing when its digit equals the digit of the
+    # matching push plus that push's y offset plus its own x offset, so
+    # offsets that differ by more than eight would leave no valid number
+    program = []
+    pending: list[int] = []
+    for push in kinds:
+        if push:
+            x = rng.randint(10, 15)
+            y = rng.randint(1, 16)
+            pending.append(y)
+        else:
+            x = rng.randint(-8, 8) - pending.pop()
+            y = rng.randint(1, 16)
+        program += [
+            "inp w",
+            "mul x 0",
+            "add x z",
+            "mod x 26",
+            f"div z {1 if push else 26}",
+            f"add x {x}",
+            "eql x w",
+            "eql x 0",
+            "mul y 0",
+            "add y 25",
+            "mul y x",
+            "add y 1",
+            "mul z y",
+            "mul y 0",
+            "add y w",
+            f"add y {y}",
+            "mul y x",
+            "add z y",
+        ]
+    return "\n".join(program)
+
+
+def day25(size: int, rng: random.Random) -> str:
+    return digit_grid(size, rng, ">v.")
+
+
+GENERATORS: dict[int, Generator] = {
+    1: day1,
+    2: day2,
+    3: day3,
+    4: day4,
+    5: day5,
+    6: day6,
+    7: day7,
+    8: day8,
+    9: day9,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+    17: day17,
+    18: day18,
+    19: day19,
+    20: day20,
+    21: day21,
+    22: day22,
+    23: day23,
+    24: day24,
+    25: day25,
+}
+
+
+def deep_day12(size: int, rng: random.Random) -> str:
+
+    # A single corridor of small caves, so every path is as long as the input
+    caves = ["start"] + cave_names(max(1, size), string.ascii_lowercase) + ["end"]
+    return "\n".join(f"{a}-{b}" for a, b in zip(caves, caves[1:]))
+
+
+def deep_day13(size: int, rng: random.Random) -> str:
+
+    # Folding along every line from size down to one in turn keeps the
+    # coordinates of the points from ever becoming negative
+    size = max(1, size)
+    folds = [(axis, line) for line in range(size, 0, -1) for axis in "xy"]
+    points = [
+        f"{rng.randint(0, 2 * size)},{rng.randint(0, 2 * size)}" for _ in range(100)
+    ]
+    instructions = [f"fold along {axis}={line}" for axis, line in folds]
+    return "\n".join(points) + "\n\n" + "\n".join(instructions)
+
+
+def deep_day16(size: int, rng: random.Random) -> str:
+
+    # Sums, minimums and maximums of a single packet, nested size levels deep
+    bits = "".join(
+        f"{rng.randrange(8):03b}{rng.choice([0, 2, 3]):03b}1{1:011b}"
+        for _ in range(size)
+    )
+    bits += f"{rng.randrange(8):03b}100{rng.randrange(16):05b}"
+    bits += "0" * (-len(bits) % 4)
+    return f"{int(bits, 2):0{len(bits) // 4}X}"
+
+
+def deep_day18(size: int, rng: random.Random) -> str:
+
+    # Every level wraps the number so far in a pair with a regular number
+    opening: list[str] = []
+    closing: list[str] = []
+    for _ in range(size):
+        digit = rng.randrange(10)
+        if rng.random() < 0.5:
+            opening.append("[")
+            closing.append(f",{digit}]")
+        else:
+            opening.append(f"[{digit},")
+            closing.append("]")
+    return "".join(opening) + str(rng.randrange(10)) + "".join(reversed(closing))
+
+
+# Generators of inputs that grow deeper rather than wider with the size, such
+# as longer paths, more folds or more levels of nesting
+DEEP: dict[int, Generator] = {
+    12: deep_day12,
+    13: deep_day13,
+    16: deep_day16,
+    18: deep_day18,
+}
+
+
+def generate(day: int, size: int, seed: int = 0, deep: bool = False) -> str:
+
+    generator = DEEP[day] if deep else GENERATORS[day]
+    return generator(size, random.Random(f"{day}:{size}:{seed}"))
+
+
+def write(day: int, size: int, path: Path, seed: int = 0, deep: bool = False) -> Path:
+    path.write_text(generate(day, size, seed, deep))
+    return path
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.generate", description="Generate synthetic puzzle inputs"
+    )
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("-n", "--size", type=int, default=100)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help=f"generate an input that is deep rather than wide, for days "
+        f"{', '.join(map(str, DEEP))}",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="output file (default: standard output)"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if args.deep and args.day not in DEEP:
+        print(f"No deep inputs for day {args.day}", file=sys.stderr)
+        return 2
+    text = generate(args.day, args.size, args.seed, args.deep)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Flat two-dimensional grids of small integers
+
+A Grid stores its cells row by row in a single bytearray. Unless the grid
+wraps around, it is surrounded by a border of sentinel cells, which means
+that the neighbours of a cell are found by adding precomputed offsets to
+its index without any bounds checks or tuple allocations.
+"""
+from __future__ import annotations
+from typing import Iterator
+
+Direction = tuple[int, int]
+
+ORTHOGONAL: tuple[Direction, ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
+ADJACENT: tuple[Direction, ...] = ORTHOGONAL + ((1, -1), (1, 1), (-1, 1), (-1, -1))
+# The 3x3 block around a cell in row-major order, including the cell itself
+BLOCK: tuple[Direction, ...] = tuple((x, y) for y in (-1, 0, 1) for x in (-1, 0, 1))
+
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class Grid:
+
+    __slots__ = ("width", "height", "border", "padding", "wrap", "stride", "cells")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        border: int = 255,
+        padding: int = 1,
+        wrap: bool = False,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.border = border
+        self.wrap = wrap
+        self.padding = 0 if wrap else padding
+        self.stride = width + 2 * self.padding
+        self.cells = bytearray([border]) * (self.stride * (height + 2 * self.padding))
+
+    @classmethod
+    def parse(
+        cls,
+        text: str,
+        table: bytes | None = None,
+        border: int = 255,
+        padding: int = 1,
+        wrap: bool = False,
+    ) -> Grid:
+        """Parses rows of characters, optionally translating them with a table"""
+
+        rows = text.encode().splitlines()
+        grid = cls(len(rows[0]), len(rows), border, padding, wrap)
+        for y, row in enumerate(rows):
+            grid.row(y)[:] = row.translate(table) if table else row
+        return grid
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def copy(self) -> Grid:
+        grid = Grid.__new__(Grid)
+        for attribute in Grid.__slots__:
+            setattr(grid, attribute, getattr(self, attribute))
+        grid.cells = bytearray(self.cells)
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def point(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def indices(self) -> Iterator[int]:
+        """Yields the index of every cell within the grid"""
+
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def row(self, y: int) -> memoryview:
+        start = self.index(0, y)
+        return memoryview(self.cells)[start : start + self.width]
+
+    def column(self, x: int) -> memoryview:
+        start = self.index(x, 0)
+        end = self.index(x, self.height - 1) + 1
+        return memoryview(self.cells)[start : end : self.stride]
+
+    def offsets(self, directions: tuple[Direction, ...]) -> tuple[int, ...]:
+        """Index offsets of the directions, valid for grids that do not wrap"""
+
+        assert not self.wrap
+        return tuple(y * self.stride + x for x, y in directions)
+
+    def neighbours(
+        self, index: int, directions: tuple[Direction, ...] = ORTHOGONAL
+    ) -> Iterator[int]:
+        """Yields the indices of the neighbours within the grid"""
+
+        x, y = self.point(index)
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if self.wrap:
+                nx, ny = nx % self.width, ny % self.height
+            elif not (0 <= nx < self.width and 0 <= ny < self.height):
+                continue
+            yield self.index(nx, ny)
+
+    def count(self, value: int) -> int:
+        return sum(self.row(y).tobytes().count(value) for y in range(self.height))
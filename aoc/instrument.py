@@ -0,0 +1,113 @@
+"""Named counters, timers and cache statistics for the solvers
+
+Instrumentation is off unless the runner starts it. While it is off, count()
+and peak() return after checking a flag, timer() hands out a shared null
+context and cache() is plain functools.cache, so solvers can call them freely
+outside of their innermost loops. Inside those loops, count into a local and
+record the total once.
+"""
+import functools
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any, Callable, ContextManager, TypeVar
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+enabled = False
+counters: dict[str, int] = {}
+timers: dict[str, float] = {}
+caches: list[Any] = []
+
+
+@dataclass(frozen=True)
+class Report:
+
+    counters: dict[str, int] = field(default_factory=dict)
+    timers: dict[str, float] = field(default_factory=dict)
+
+
+def start() -> None:
+    global enabled
+    counters.clear()
+    timers.clear()
+    caches.clear()
+    enabled = True
+
+
+def stop() -> Report:
+    """Stops collecting and returns everything collected since start()"""
+
+    global enabled
+    enabled = False
+
+    # A cached function defined inside another one gets a new cache on every
+    # call, so the statistics of caches with the same name are combined
+    for function in caches:
+        name = function.__qualname__.replace(".<locals>", "")
+        info = function.cache_info()
+        counters[f"{name}.hits"] = counters.get(f"{name}.hits", 0) + info.hits
+        counters[f"{name}.misses"] = counters.get(f"{name}.misses", 0) + info.misses
+        counters[f"{name}.size"] = max(counters.get(f"{name}.size", 0), info.currsize)
+    caches.clear()
+
+    return Report(dict(sorted(counters.items())), dict(sorted(timers.items())))
+
+
+def count(name: str, amount: int = 1) -> None:
+    if enabled:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def peak(name: str, value: int) -> None:
+    """Keeps the largest value seen under the name"""
+
+    if enabled:
+        counters[name] = max(counters.get(name, value), value)
+
+
+class Timer:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        kind: type[BaseException] | None,
+        error: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        elapsed = time.perf_counter() - self.start
+        timers[self.name] = timers.get(self.name, 0.0) + elapsed
+
+
+NULL_TIMER = nullcontext()
+
+
+def timer(name: str) -> ContextManager[None]:
+    """Adds the time spent in the with block to the named timer"""
+
+    return Timer(name) if enabled else NULL_TIMER
+
+
+def cache(function: Function) -> Function:
+    """functools.cache whose statistics are reported while collecting"""
+
+    cached = functools.cache(function)
+    if enabled:
+        caches.append(cached)
+    return cached  # type: ignore
+
+
+def format_report(name: str, report: Report) -> str:
+
+    lines = [f"{name}:"]
+    width = max(map(len, [*report.counters, *report.timers]), default=0)
+    for counter, value in report.counters.items():
+        lines.append(f"  {counter:<{width}} {value:>14,}")
+    for timer_name, seconds in report.timers.items():
+        lines.append(f"  {timer_name:<{width}} {seconds:>13.3f}s")
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+"""Peak memory and allocation site tracking with tracemalloc
+
+Allocations are usually freed by the time a solution returns, so a snapshot
+taken at the end would miss them. Instead a background thread samples the
+traced memory and keeps a snapshot of the largest heap it has seen.
+"""
+import resource
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).parent.parent
+
+
+@dataclass(frozen=True)
+class Site:
+
+    location: str
+    size: int
+    count: int
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+
+    peak: int
+    rss: int
+    sites: list[Site] = field(default_factory=list)
+
+
+def rss() -> int:
+    """Current resident set size in bytes, or the peak where that is unknown"""
+
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def location(frame: tracemalloc.Frame) -> str:
+    path = Path(frame.filename)
+    if path.is_relative_to(ROOT):
+        path = path.relative_to(ROOT)
+    return f"{path}:{frame.lineno}"
+
+
+class Sampler(threading.Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.largest = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        # Snapshots are expensive, so only take one when the heap has grown
+        # noticeably since the previous one
+        if current > self.largest * 1.1:
+            self.largest = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+
+def trace(
+    function: Callable[[], object], top: int = 10, interval: float = 0.01
+) -> MemoryReport:
+    """Runs the function under tracemalloc and reports its memory usage"""
+
+    tracemalloc.start()
+    sampler = Sampler(interval)
+    sampler.start()
+    try:
+        function()
+    finally:
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = sampler.snapshot
+        tracemalloc.stop()
+
+    sites = []
+    if snapshot:
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, threading.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        for statistic in snapshot.statistics("lineno")[:top]:
+            sites.append(
+                Site(
+                    location(statistic.traceback[0]),
+                    statistic.size,
+                    statistic.count,
+                )
+            )
+
+    return MemoryReport(peak, rss(), sites)
+
+
+def size(amount: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if amount < 1024:
+            return f"{amount:.1f} {unit}"
+        amount /= 1024
+    return f"{amount:.1f} GiB"
+
+
+def format_report(name: str, report: MemoryReport) -> str:
+
+    lines = [f"{name}: peak {size(report.peak)}, final RSS {size(report.rss)}"]
+    for site in report.sites:
+        lines.append(
+            f"  {size(site.size):>12} {site.count:>10} blocks  {site.location}"
+        )
+    return "\n".join(lines)
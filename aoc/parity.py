@@ -0,0 +1,136 @@
+"""Check that every backend gives the same answers
+
+Each day that registers kernels with aoc.backends is solved on generated
+inputs once per available backend, and the answers are compared. Some parts
+never finish on random inputs, such as day 11 when the octopuses never flash
+at once, so every answer gets a time limit and is skipped if it runs out.
+"""
+import argparse
+import io
+import signal
+import sys
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Callable
+
+from aoc import backends
+from aoc.generate import generate
+from aoc.runner import discover, load, parts, prepare
+
+
+class OutOfTime(Exception):
+    pass
+
+
+def within(seconds: float, function: Callable[[Any], Any], data: Any) -> Any:
+    def expire(signum: int, frame: FrameType | None) -> None:
+        raise OutOfTime
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        return function(data)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@dataclass
+class Parity:
+
+    compared: int = 0
+    skipped: int = 0
+    mismatches: list[str] = field(default_factory=list)
+
+
+def compare(day: int, sizes: list[int], seeds: int, seconds: float) -> Parity:
+    """Solves generated inputs with every backend and collects any mismatch"""
+
+    module = load(day)
+    parity = Parity()
+    for size in sizes:
+        for seed in range(seeds):
+            source = io.BytesIO(generate(day, size, seed).encode())
+            data = prepare(module, module.parse_input(source))
+            for number, part in enumerate(parts(module), 1):
+                answers = {}
+                try:
+                    for name in backends.available():
+                        backends.use(name)
+                        try:
+                            answers[name] = within(seconds, part, data)
+                        except ValueError as e:
+                            # Inputs without an answer, such as a herd that
+                            # never settles on day 25, should be refused alike
+                            answers[name] = e
+                except OutOfTime:
+                    parity.skipped += 1
+                    continue
+                parity.compared += 1
+                if len(set(map(repr, answers.values()))) > 1:
+                    parity.mismatches.append(
+                        f"size {size}, seed {seed}, part {number}: {answers}"
+                    )
+    return parity
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.parity",
+        description="Check that every backend gives the same answers",
+    )
+    parser.add_argument(
+        "days", nargs="*", type=int, help="days to check (default: all with kernels)"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        nargs="+",
+        default=[10, 50, 100],
+        help="sizes of the generated inputs (default: 10 50 100)",
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=3, help="inputs per size (default: 3)"
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=10.0,
+        metavar="SECONDS",
+        help="time each answer may take before it is skipped (default: 10)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    if len(backends.available()) < 2:
+        print("NumPy is not available, so there is nothing to compare", file=sys.stderr)
+        return 0
+
+    for day in discover():
+        load(day)
+    days = args.days or sorted(
+        {int(kernel.__module__.split(".")[1][3:]) for kernel in backends.KERNELS}
+    )
+
+    failed = False
+    selected = backends.current
+    for day in days:
+        parity = compare(day, args.size, args.seeds, args.time_limit)
+        print(
+            f"day {day}: {'MISMATCH' if parity.mismatches else 'ok'}, "
+            f"{parity.compared} answers compared, {parity.skipped} out of time",
+            flush=True,
+        )
+        for mismatch in parity.mismatches:
+            print(f"  {mismatch}", file=sys.stderr)
+        failed |= bool(parity.mismatches)
+    backends.use(selected)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
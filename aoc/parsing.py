@@ -0,0 +1,149 @@
+"""Whole-file input parsing
+
+Inputs are read as bytes once and scanned in a single pass, instead of being
+split into lines that are matched or converted one at a time. int() accepts
+bytes directly, so nothing is decoded unless a day needs strings.
+
+An input source is the path of a file, "-" for stdin or a binary stream.
+Days whose inputs are a line per record can instead iterate over lines(),
+which maps files into memory rather than reading them whole, and split files
+into spans() of whole lines for separate processes to read.
+"""
+import io
+import mmap
+import os
+import re
+import sys
+from itertools import pairwise
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+Source = str | os.PathLike[str] | BinaryIO
+
+# Lines are split off a mapped file this many bytes at a time
+CHUNK = 1 << 20
+
+# Translation tables that turn every byte that cannot be part of an integer
+# into whitespace, with and without keeping minus signs
+SIGNED = bytes(b if b in b"0123456789-" else ord(" ") for b in range(256))
+UNSIGNED = bytes(b if b in b"0123456789" else ord(" ") for b in range(256))
+
+
+def read(source: Source) -> bytes:
+    """The whole input, with Windows line breaks turned into plain ones"""
+
+    if source == "-":
+        data = sys.stdin.buffer.read()
+    elif isinstance(source, (str, os.PathLike)):
+        data = Path(source).read_bytes()
+    else:
+        data = source.read()
+    return data.replace(b"\r\n", b"\n")
+
+
+def text(source: Source) -> str:
+    return read(source).decode()
+
+
+def lines(source: Source) -> Iterator[bytes]:
+    """The lines of the input without their line breaks, read lazily
+
+    Files are mapped into memory and split a chunk of whole lines at a time,
+    so the operating system pages them in as the lines are consumed and
+    inputs larger than memory are never held at once. Streams that cannot be
+    mapped, such as pipes or BytesIO, are read in chunks of lines instead.
+    Either way the lines start at the stream's position, which is moved past
+    each chunk as it is split, as readlines() would.
+    """
+
+    if source == "-":
+        source = sys.stdin.buffer
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from lines(f)
+        return
+
+    try:
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # Also raised for empty files, which cannot be mapped
+        while batch := source.readlines(CHUNK):
+            yield from (line.rstrip(b"\r\n") for line in batch)
+        return
+
+    with mapped:
+        for start, stop in chunk_bounds(mapped, source.tell(), len(mapped)):
+            source.seek(stop)
+            yield from mapped[start:stop].splitlines()
+
+
+def split(mapped: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+
+    for start, stop in chunk_bounds(mapped, start, end):
+        yield from mapped[start:stop].splitlines()
+
+
+def chunk_bounds(mapped: mmap.mmap, start: int, end: int) -> Iterator[tuple[int, int]]:
+
+    while start < end:
+        # Cut the chunk after its last line break, or after the first one
+        # past it if a single line is longer than a chunk
+        stop = end
+        if end - start > CHUNK:
+            stop = mapped.rfind(b"\n", start, start + CHUNK) + 1
+        if not stop:
+            stop = mapped.find(b"\n", start + CHUNK, end) + 1 or end
+        yield start, stop
+        start = stop
+
+
+def mapping(path: str | os.PathLike[str]) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def spans(path: str | os.PathLike[str], count: int) -> list[tuple[int, int]]:
+    """Splits a file into at most count byte ranges of whole lines"""
+
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    with mapping(path) as mapped:
+        cuts = [0]
+        for number in range(1, count):
+            cut = mapped.find(b"\n", max(cuts[-1], size * number // count)) + 1
+            if not cut or cut == size:
+                break
+            if cut > cuts[-1]:
+                cuts.append(cut)
+    return list(pairwise(cuts + [size]))
+
+
+def span_lines(path: str | os.PathLike[str], start: int, end: int) -> Iterator[bytes]:
+    """The lines of a span returned by spans(), read lazily like lines()"""
+
+    with mapping(path) as mapped:
+        yield from split(mapped, start, end)
+
+
+def integers(data: bytes, signed: bool = True) -> list[int]:
+    """Every integer in the data, in order
+
+    Translating and splitting the whole buffer is about twice as fast as
+    matching a regular expression. Signed data must not contain minus signs
+    outside of numbers, e.g. arrows, so those are parsed with signed=False.
+    """
+
+    return list(map(int, data.translate(SIGNED if signed else UNSIGNED).split()))
+
+
+def chunks(values: list[int], size: int) -> Iterator[tuple[int, ...]]:
+    """Groups a flat list into consecutive tuples of the given size"""
+
+    return zip(*[iter(values)] * size)
+
+
+def records(pattern: re.Pattern[bytes], data: bytes) -> Iterator[tuple[bytes, ...]]:
+    """The groups of every match of a compiled pattern, in a single pass"""
+
+    return (match.groups() for match in pattern.finditer(data))
@@ -0,0 +1,108 @@
+"""cProfile capture with collapsed-stack export for flamegraph tools
+
+cProfile only records caller-callee pairs rather than full stacks, so the
+stacks are rebuilt by walking the call graph from its roots and splitting
+each function's time between its callers in proportion to the time spent
+under each caller. The walk stops at a fixed depth and folds calls too short
+to show up into their callers, so the number of stacks stays bounded however
+many paths lead through the shared helpers.
+"""
+import cProfile
+import pstats
+from pathlib import Path
+from typing import Callable, Iterator
+
+Function = tuple[str, int, str]
+
+ROOT = Path(__file__).parent.parent
+
+# Bounds on the rebuilt stacks, which would otherwise grow with the number of
+# paths through the call graph. A call taking a ten-thousandth of the run is
+# far narrower than a pixel of a flamegraph
+MAX_DEPTH = 64
+MIN_SHARE = 1e-4
+
+
+def label(function: Function) -> str:
+
+    file, line, name = function
+    if file == "~":
+        return name
+    path = Path(file)
+    if path.is_relative_to(ROOT):
+        file = str(path.relative_to(ROOT))
+    else:
+        file = path.name
+    return f"{name} ({file}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Iterator[tuple[str, int]]:
+    """Yields (semicolon separated stack, microseconds) pairs"""
+
+    entries = stats.stats  # type: ignore
+    callees: dict[Function, list[Function]] = {function: [] for function in entries}
+    for function, (*_, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(function)
+
+    roots = [function for function, (*_, callers) in entries.items() if not callers]
+    shortest = MIN_SHARE * sum(entries[root][3] for root in roots)
+    labels = {function: label(function) for function in callees}
+    stack: list[str] = []
+    on_stack: set[Function] = set()
+
+    def walk(function: Function, scale: float) -> Iterator[tuple[str, int]]:
+
+        _, _, own, _, _ = entries[function]
+        stack.append(labels[function])
+        on_stack.add(function)
+
+        # A call graph with helpers shared by many callers has exponentially
+        # many paths, so calls too short to show up in a flamegraph, and any
+        # below the deepest frame, are folded into their caller
+        calls = []
+        folded = own * scale
+        for callee in callees[function]:
+            if callee in on_stack:
+                continue
+            *_, callee_total, callers = entries[callee]
+            edge_total = callers[function][3]
+            if callee_total <= 0 or edge_total <= 0:
+                continue
+            if len(stack) < MAX_DEPTH and edge_total * scale >= shortest:
+                calls.append((callee, scale * edge_total / callee_total))
+            else:
+                folded += edge_total * scale
+
+        if (micros := round(folded * 1_000_000)) > 0:
+            yield ";".join(stack), micros
+        for callee, callee_scale in calls:
+            yield from walk(callee, callee_scale)
+
+        stack.pop()
+        on_stack.remove(function)
+
+    for root in roots:
+        yield from walk(root, 1.0)
+
+
+def profile(
+    function: Callable[[], object], name: str, directory: Path
+) -> tuple[Path, Path]:
+    """Profiles the function and writes name.pstats and name.collapsed"""
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(function)
+    finally:
+        directory.mkdir(parents=True, exist_ok=True)
+        stats_path = directory / f"{name}.pstats"
+        collapsed_path = directory / f"{name}.collapsed"
+
+        profiler.dump_stats(stats_path)
+        stats = pstats.Stats(profiler)
+        with collapsed_path.open("w") as collapsed:
+            for stack, micros in collapsed_stacks(stats):
+                collapsed.write(f"{stack} {micros}\n")
+
+    return stats_path, collapsed_path
@@ -0,0 +1,298 @@
+import asyncio
+import importlib
+import os
+import pickle
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator
+
+from aoc import instrument
+from aoc.cache import cached_parse_input, cached_result, day_inputs
+from aoc.generate import write
+from aoc.memory import MemoryReport, trace
+from aoc.profiling import profile
+
+
+@dataclass(frozen=True)
+class Phases:
+
+    parse: float
+    parts: list[float]
+    answers: list[Any]
+    # Only days with a prepare() step have this phase
+    prepare: float | None = None
+
+
+@dataclass(frozen=True)
+class Timing:
+
+    day: int
+    wall: float
+    cpu: float
+    error: str = ""
+    memory: MemoryReport | None = None
+    cached: bool = False
+    counters: instrument.Report | None = None
+    timed_out: bool = False
+    phases: Phases | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass(frozen=True)
+class Options:
+
+    profile_directory: Path | None = None
+    memory: bool = False
+    input_cache: bool = False
+    result_cache: bool = False
+    counters: bool = False
+    # Seconds each day may take, by default and for particular days. Days
+    # with a deadline run in isolated subprocesses that are killed once it
+    # passes
+    timeout: float | None = None
+    deadlines: dict[int, float] = field(default_factory=dict)
+    # Solve generated inputs of this size instead of the puzzle inputs, whose
+    # answers are unknown and so not checked
+    size: int | None = None
+    seed: int = 0
+
+    @property
+    def isolated(self) -> bool:
+        return self.timeout is not None or bool(self.deadlines)
+
+    def deadline(self, day: int) -> float | None:
+        return self.deadlines.get(day, self.timeout)
+
+
+def discover() -> list[int]:
+    """The numbered days, which leaves out the template"""
+
+    days = []
+    for puzzle in Path(__file__).parent.glob("day*/puzzle.py"):
+        suffix = puzzle.parent.name.removeprefix("day")
+        if suffix.isdigit():
+            days.append(int(suffix))
+    return sorted(days)
+
+
+def load(day: int) -> ModuleType:
+    return importlib.import_module(f"aoc.day{day}.puzzle")
+
+
+def parts(module: ModuleType) -> list[Callable[[Any], Any]]:
+    """The day's part1() and part2(), which take the parsed input"""
+
+    return [
+        getattr(module, name) for name in ("part1", "part2") if hasattr(module, name)
+    ]
+
+
+def prepare(module: ModuleType, data: Any) -> Any:
+    """The parsed input made ready for the parts
+
+    Days whose parts share expensive work, such as aligning the scanners on
+    day 19, do it once in prepare(), which takes the parsed input and returns
+    what the parts take. Other days pass the parsed input on as it is.
+    """
+
+    return module.prepare(data) if hasattr(module, "prepare") else data
+
+
+def check(module: ModuleType, path: Path | None = None) -> Phases:
+    """Times parsing, preparing and each part separately and checks the answers
+
+    Only the answers for the day's own input are known, so those for any
+    other input are returned unchecked. A part that answers None, or whose
+    answer is None in ANSWERS, is unsolved and fails on any input.
+    """
+
+    if not parts(module):
+        raise AssertionError("the day defines neither part1() nor part2()")
+
+    start = time.perf_counter()
+    data = module.parse_input() if path is None else module.parse_input(path)
+    parse = time.perf_counter() - start
+
+    prepared = None
+    if hasattr(module, "prepare"):
+        start = time.perf_counter()
+        data = prepare(module, data)
+        prepared = time.perf_counter() - start
+
+    durations = []
+    answers = []
+    for number, part in enumerate(parts(module), 1):
+        start = time.perf_counter()
+        answer = part(data)
+        durations.append(time.perf_counter() - start)
+        if answer is None or module.ANSWERS[number - 1] is None:
+            raise AssertionError(f"part {number} is unsolved")
+        if path is None and answer != (expected := module.ANSWERS[number - 1]):
+            raise AssertionError(f"part {number} is {answer!r}, expected {expected!r}")
+        answers.append(answer)
+
+    return Phases(parse, durations, answers, prepared)
+
+
+def run_day(day: int, options: Options = Options()) -> Timing:
+    """Runs and checks the day's solution, optionally under cProfile or tracemalloc
+
+    The phases are only timed in plain runs, since profiling or tracing
+    distorts them and cached results were timed by an earlier run. With
+    counters enabled, whatever the solution records through aoc.instrument
+    is returned along with the timing.
+    """
+
+    module = load(day)
+    if options.size is None:
+        return solve_day(day, module, options)
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / f"day{day}-{options.size}.txt"
+        return solve_day(
+            day, module, options, write(day, options.size, path, options.seed)
+        )
+
+
+def solve_day(
+    day: int, module: ModuleType, options: Options, path: Path | None = None
+) -> Timing:
+
+    parse_input = module.parse_input
+    if options.input_cache:
+        setattr(module, "parse_input", cached_parse_input(module))
+
+    error = ""
+    report = None
+    cached = False
+    counters = None
+    phases = None
+    if options.counters:
+        instrument.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        if options.profile_directory:
+            profile(lambda: check(module, path), f"day{day}", options.profile_directory)
+        elif options.memory:
+            report = trace(lambda: check(module, path))
+        elif options.result_cache:
+            inputs = [path] if path else day_inputs(module)
+            result, cached = cached_result(
+                module, "runner", inputs, lambda: check(module, path)
+            )
+            phases = None if cached else result
+        else:
+            phases = check(module, path)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+    finally:
+        setattr(module, "parse_input", parse_input)
+        if options.counters:
+            counters = instrument.stop()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return Timing(day, wall, cpu, error, report, cached, counters, phases=phases)
+
+
+async def run_isolated(day: int, options: Options) -> Timing:
+    """Runs the day in a subprocess and kills it if it misses its deadline"""
+
+    deadline = options.deadline(day)
+    start = time.perf_counter()
+    # The subprocess leads a session of its own, so that killing its process
+    # group also kills any processes the solution started, e.g. day18's pool
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "aoc.worker",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        output, errors = await asyncio.wait_for(
+            process.communicate(pickle.dumps((day, options))), deadline
+        )
+    except asyncio.TimeoutError:
+        os.killpg(process.pid, signal.SIGKILL)
+        await process.wait()
+        wall = time.perf_counter() - start
+        return Timing(day, wall, 0.0, f"timed out after {deadline:g} s", timed_out=True)
+
+    if process.returncode != 0 or not output:
+        wall = time.perf_counter() - start
+        error = f"worker exited with status {process.returncode}"
+        if lines := errors.decode(errors="replace").strip().splitlines():
+            error += f": {lines[-1]}"
+        return Timing(day, wall, 0.0, error)
+    return pickle.loads(output)
+
+
+async def schedule(
+    days: Iterable[int], workers: int | None, options: Options
+) -> list[Timing]:
+    """Runs isolated days concurrently and returns them in completion order"""
+
+    limit = asyncio.Semaphore(workers or os.cpu_count() or 1)
+    timings: list[Timing] = []
+
+    async def run(day: int) -> None:
+        async with limit:
+            timings.append(await run_isolated(day, options))
+
+    await asyncio.gather(*(run(day) for day in days))
+    return timings
+
+
+def run_days(
+    days: Iterable[int], workers: int | None = None, options: Options = Options()
+) -> Iterator[Timing]:
+    """Yields timings in completion order"""
+
+    if options.isolated:
+        yield from asyncio.run(schedule(days, workers, options))
+        return
+
+    # Memory is measured in a fresh process for every day, so that earlier
+    # days do not inflate the resident set size of later ones. Only pass
+    # max_tasks_per_child then, since it needs Python 3.11
+    fresh: dict[str, Any] = {"max_tasks_per_child": 1} if options.memory else {}
+    with ProcessPoolExecutor(max_workers=workers, **fresh) as pool:
+        futures = [pool.submit(run_day, day, options) for day in days]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def table(timings: Iterable[Timing]) -> str:
+
+    rows = [
+        f"{'day':>5} {'wall (s)':>10} {'cpu (s)':>10} "
+        f"{'parse (s)':>10} {'prep (s)':>10} {'part 1 (s)':>10} {'part 2 (s)':>10}  "
+        "status"
+    ]
+    for timing in sorted(timings, key=lambda t: t.day):
+        status = "ok" if timing.ok else timing.error
+        if timing.cached:
+            status += " (cached)"
+        phases = [""] * 4
+        if timing.phases:
+            timed = timing.phases
+            durations = [timed.parse, timed.prepare, *timed.parts]
+            phases[: len(durations)] = [
+                "" if seconds is None else f"{seconds:.3f}" for seconds in durations
+            ]
+        rows.append(
+            f"{timing.day:>5} {timing.wall:>10.3f} {timing.cpu:>10.3f} "
+            f"{phases[0]:>10} {phases[1]:>10} {phases[2]:>10} {phases[3]:>10}  {status}"
+        )
+    return "\n".join(rows)
@@ -0,0 +1,148 @@
+"""Shortest path searches over implicit graphs
+
+A graph is given by a function yielding the (neighbour, weight) pairs of a
+node, and the search stops at the first node accepted by `done`. Entries are
+deleted lazily: a node may sit in the frontier several times, and the pops of
+all but its cheapest entry are counted as stale.
+
+The best known costs live in a Costs dict by default. Graphs whose nodes are
+small integers, such as grid indices, can pass a list of infinities instead,
+which is considerably faster to index.
+
+Pass a SearchStats to see how much work a search did. The counters are kept
+in local variables and only written back when the search returns.
+"""
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from itertools import count
+from typing import Any, Callable, Hashable, Iterable, MutableSequence, TypeVar
+
+Node = TypeVar("Node", bound=Hashable)
+Neighbours = Callable[[Node], Iterable[tuple[Node, int]]]
+
+INFINITY = float("inf")
+
+
+class Costs(dict):
+    """Best known costs, infinite for nodes that have not been reached"""
+
+    def __missing__(self, node: Hashable) -> float:
+        return INFINITY
+
+
+@dataclass
+class SearchStats:
+
+    expanded: int = 0
+    stale: int = 0
+    peak_frontier: int = 0
+
+
+def astar(
+    start: Node,
+    neighbours: Neighbours[Node],
+    done: Callable[[Node], bool],
+    heuristic: Callable[[Node], int],
+    stats: SearchStats | None = None,
+    costs: Costs | MutableSequence[Any] | None = None,
+) -> int | None:
+    """Cost of the cheapest path to a done node, or None if there is none
+
+    The heuristic must never overestimate the remaining cost, and must not
+    decrease by more than the weight of any edge, for the result to be exact.
+    """
+
+    costs = Costs() if costs is None else costs
+    costs[start] = 0  # type: ignore
+    # The counter breaks ties so that nodes never have to be comparable
+    tiebreak = count()
+    frontier = [(heuristic(start), next(tiebreak), 0, start)]
+    expanded = stale = peak = 0
+
+    try:
+        while frontier:
+            _, _, cost, node = heappop(frontier)
+            if costs[node] < cost:  # type: ignore
+                stale += 1
+                continue
+            if done(node):
+                return cost
+            expanded += 1
+
+            for neighbour, weight in neighbours(node):
+                total = cost + weight
+                if total < costs[neighbour]:  # type: ignore
+                    costs[neighbour] = total  # type: ignore
+                    estimate = total + heuristic(neighbour)
+                    heappush(frontier, (estimate, next(tiebreak), total, neighbour))
+            peak = max(peak, len(frontier))
+        return None
+    finally:
+        if stats:
+            stats.expanded += expanded
+            stats.stale += stale
+            stats.peak_frontier = max(stats.peak_frontier, peak)
+
+
+def dijkstra(
+    start: Node,
+    neighbours: Neighbours[Node],
+    done: Callable[[Node], bool],
+    stats: SearchStats | None = None,
+    costs: Costs | MutableSequence[Any] | None = None,
+) -> int | None:
+    return astar(start, neighbours, done, lambda _: 0, stats, costs)
+
+
+def dial(
+    start: Node,
+    neighbours: Neighbours[Node],
+    done: Callable[[Node], bool],
+    max_weight: int,
+    stats: SearchStats | None = None,
+    costs: Costs | MutableSequence[Any] | None = None,
+) -> int | None:
+    """Dijkstra with a bucket queue, for small non-negative integer weights
+
+    Every entry in the frontier costs between the current cost and the
+    current cost plus max_weight, so a ring of max_weight + 1 buckets holds
+    them all and pushing or popping never has to compare costs.
+    """
+
+    costs = Costs() if costs is None else costs
+    costs[start] = 0  # type: ignore
+    buckets: list[list[Node]] = [[] for _ in range(max_weight + 1)]
+    buckets[0].append(start)
+    size = 1
+    cost = 0
+    expanded = stale = peak = 0
+
+    try:
+        while size:
+            bucket = buckets[cost % len(buckets)]
+            if not bucket:
+                cost += 1
+                continue
+
+            node = bucket.pop()
+            size -= 1
+            if costs[node] < cost:  # type: ignore
+                stale += 1
+                continue
+            if done(node):
+                return cost
+            expanded += 1
+
+            for neighbour, weight in neighbours(node):
+                total = cost + weight
+                if total < costs[neighbour]:  # type: ignore
+                    costs[neighbour] = total  # type: ignore
+                    buckets[total % len(buckets)].append(neighbour)
+                    size += 1
+            peak = max(peak, size)
+        return None
+    finally:
+        if stats:
+            stats.expanded += expanded
+            stats.stale += stale
+            stats.peak_frontier = max(stats.peak_frontier, peak)
@@ -0,0 +1,141 @@
+"""A long-lived solver that answers requests over a Unix domain socket
+
+Starting the interpreter and importing a day costs more than solving most of
+the early days, so the server starts a pool of worker processes once, has
+every one of them import all the days, and then hands them requests.
+
+A request is a JSON header line followed by the input itself:
+
+    {"day": 1, "size": 9775}\\n<9775 bytes of input>
+
+and the response is a single JSON line holding the answers, the time the
+worker spent solving and the error, if any. A connection may send any number
+of requests, which are answered in order.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from aoc.batch import answers
+from aoc.runner import discover, load
+
+SOCKET = Path(tempfile.gettempdir()) / f"aoc-{os.getuid()}.sock"
+
+
+def preload() -> None:
+    for day in discover():
+        load(day)
+
+
+def failure(error: str) -> dict[str, Any]:
+    return {"answers": None, "wall": 0.0, "error": error}
+
+
+def solve(day: int, data: bytes) -> dict[str, Any]:
+    """Solves the day for the input, in one of the warm workers"""
+
+    start = time.perf_counter()
+    try:
+        results = answers(load(day), io.BytesIO(data))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        return failure(error) | {"wall": round(time.perf_counter() - start, 6)}
+    return {
+        "answers": results,
+        "wall": round(time.perf_counter() - start, 6),
+        "error": None,
+    }
+
+
+async def request(reader: asyncio.StreamReader) -> tuple[int, bytes] | None:
+    """Reads the next request, or returns None once the client is done"""
+
+    header = await reader.readline()
+    if not header:
+        return None
+    fields = json.loads(header)
+    day, size = int(fields["day"]), int(fields["size"])
+    return day, await reader.readexactly(size)
+
+
+async def serve(path: Path, workers: int | None) -> None:
+
+    loop = asyncio.get_running_loop()
+    days = discover()
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(workers, initializer=preload) as pool:
+        # Start every worker before the first request arrives
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, preload) for _ in range(workers))
+        )
+
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            try:
+                while received := await request(reader):
+                    day, data = received
+                    if day in days:
+                        response = await loop.run_in_executor(pool, solve, day, data)
+                    else:
+                        response = failure(f"unknown day {day}")
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+            except (ValueError, KeyError):
+                # The stream cannot be trusted after a malformed header
+                writer.write(json.dumps(failure("malformed request")).encode() + b"\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(handle, path)
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+
+        print(f"Serving {len(days)} days on {path}", file=sys.stderr)
+        async with server:
+            await stop.wait()
+        path.unlink(missing_ok=True)
+
+
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc.server",
+        description="Serve solutions from warm worker processes over a Unix socket",
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=SOCKET, help=f"socket path (default: {SOCKET})"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+
+    args = parse_args()
+    asyncio.run(serve(args.socket, args.workers))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
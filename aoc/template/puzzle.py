@@ -1,12 +1,38 @@
 from pathlib import Path
 
+from aoc.parsing import Source, text
 
-def parse_input() -> str:
-    return (Path(__file__).parent / "input.txt").read_text()
+
+def parse_input(source: Source = Path(__file__).parent / "input.txt") -> str:
+    return text(source)
+
+
+def part1(data: str) -> int | None:
+    """The answer to the first part of the puzzle"""
+
+    return None
+
+
+def part2(data: str) -> int | None:
+    """The answer to the second part of the puzzle"""
+
+    return None
+
+
+# The runner checks the parts of a numbered day against these, and fails
+# them as unsolved while they are None
+ANSWERS = (None, None)
 
 
 def solve() -> None:
-    print(parse_input())
+
+    data = parse_input()
+
+    # First part
+    print(part1(data))
+
+    # Second part
+    print(part2(data))
 
 
 if __name__ == "__main__":
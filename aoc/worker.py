@@ -0,0 +1,23 @@
+"""Runs a single day in a subprocess of the isolated runner
+
+The day and the runner options are read from stdin as a pickle, and the
+resulting Timing is written back to stdout. Anything the solution prints
+goes to stderr instead, so that it cannot corrupt the pickle.
+"""
+import pickle
+import sys
+from contextlib import redirect_stdout
+
+from aoc.runner import run_day
+
+
+def main() -> None:
+
+    day, options = pickle.load(sys.stdin.buffer)
+    with redirect_stdout(sys.stderr):
+        timing = run_day(day, options)
+    sys.stdout.buffer.write(pickle.dumps(timing))
+
+
+if __name__ == "__main__":
+    main()